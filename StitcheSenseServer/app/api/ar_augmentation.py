@@ -146,23 +146,23 @@ async def websocket_ar_fitting(websocket: WebSocket, session_id: str):
                 frame_data = message.get('frame_data')
                 dress_config = message.get('dress_config', {})
                 
-                logger.info(f"Received frame for session {session_id}: frame_data_length={len(frame_data) if frame_data else 0}, dress_config={dress_config}")
+                logger.debug("Received frame for session %s: frame_data_length=%d, dress_config=%s", session_id, len(frame_data) if frame_data else 0, dress_config)
                 
                 if frame_data:
                     try:
                         # Decode base64 frame
                         import base64
-                        logger.info(f"Decoding frame data for session {session_id}")
+                        logger.debug("Decoding frame data for session %s", session_id)
                         frame_bytes = base64.b64decode(frame_data.split(',')[1])
-                        logger.info(f"Frame decoded successfully, size: {len(frame_bytes)} bytes")
+                        logger.debug("Frame decoded successfully, size: %d bytes", len(frame_bytes))
                         
                         # Start processing time
                         start_time = time.time()
                         
                         # Process frame asynchronously
-                        logger.info(f"Starting frame processing for session {session_id}")
+                        logger.debug("Starting frame processing for session %s", session_id)
                         result = await ar_service.process_frame_for_ar(frame_bytes, dress_config)
-                        logger.info(f"Frame processing completed for session {session_id}: success={result.get('success')}")
+                        logger.debug("Frame processing completed for session %s: success=%s", session_id, result.get('success'))
                         
                         # Calculate processing time
                         processing_time = (time.time() - start_time) * 1000  # in ms
@@ -180,7 +180,7 @@ async def websocket_ar_fitting(websocket: WebSocket, session_id: str):
                             'session_id': session_id,
                             'timestamp': time.time()
                         }, session_id)
-                        logger.info(f"Frame result sent to session {session_id}")
+                        logger.debug("Frame result sent to session %s", session_id)
                         
                     except Exception as e:
                         logger.error(f"Frame processing error for session {session_id}: {e}")
@@ -1,5 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from typing import List, Optional
+from bson import ObjectId
 from app.models.product import ProductCreate, ProductUpdate, Product, GownCategory
 from app.services.product_service import ProductService
 from app.core.security import get_current_user
@@ -9,19 +10,33 @@ product_service = ProductService()
 
 @router.get("/", response_model=List[Product])
 async def get_products(
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of products to skip"),
     limit: int = Query(100, ge=1, le=100, description="Number of products to return"),
     category: Optional[GownCategory] = Query(None, description="Filter by category"),
-    is_featured: Optional[bool] = Query(None, description="Filter by featured status")
+    is_featured: Optional[bool] = Query(None, description="Filter by featured status"),
+    after_id: Optional[str] = Query(None, description="Return products after this product ID (cursor pagination)")
 ):
     """Get all products with filtering and pagination"""
+    if after_id is not None and not ObjectId.is_valid(after_id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid after_id cursor"
+        )
+    
     try:
         products = await product_service.get_all_products(
             skip=skip,
             limit=limit,
             category=category,
-            is_featured=is_featured
+            is_featured=is_featured,
+            after_id=after_id
         )
+        
+        # Full page: hand back the cursor for the next one
+        if len(products) == limit:
+            response.headers["X-Next-Cursor"] = str(products[-1].id)
+        
         return products
     
     except Exception as e:
@@ -12,6 +12,16 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
+    # Password hashing (lower only for dev/test bootstraps, never below 4)
+    BCRYPT_ROUNDS: int = 12
+    
+    # AR: OpenCV worker threads per server process
+    OPENCV_THREADS: int = 1
+    
+    # AR: load and warm up the TensorFlow MoveNet estimator at startup. Off by
+    # default - no request path uses it yet, and it imports TF on every start
+    PRELOAD_POSE_MODEL: bool = False
+    
     # CORS
     ALLOWED_HOSTS: List[str] = ["http://localhost:3000", "http://localhost:5173"]
     
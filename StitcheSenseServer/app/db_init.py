@@ -3,6 +3,7 @@ from motor.motor_asyncio import AsyncIOMotorClient
 from app.core.config import settings
 from app.models.product import ProductCreate, ProductImage, GownCategory, GownSize
 from app.services.product_service import ProductService
+from app.services.user_service import UserService
 
 async def seed_gowns():
     """Seed the database with sample gown data"""
@@ -160,9 +161,7 @@ async def create_indexes():
     db = await get_database()
     
     # User collection indexes
-    users_collection = db["users"]
-    await users_collection.create_index("email", unique=True)
-    await users_collection.create_index("created_at")
+    await UserService().ensure_indexes()
     
     # Products collection indexes
     products_collection = db["products"]
@@ -170,7 +169,7 @@ async def create_indexes():
     await products_collection.create_index("is_active")
     await products_collection.create_index("is_featured")
     await products_collection.create_index("rental_price")
-    await products_collection.create_index([("name", "text"), ("description", "text")])
+    await ProductService().ensure_indexes()
     
     print("Database indexes created successfully")
 
@@ -2,7 +2,7 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from bson import ObjectId
 from app.models.admin import AdminStats, AdminDashboardData, ProductCreateAdmin, ProductUpdateAdmin, UserUpdateAdmin
-from app.models.user import UserInDB, UserResponse
+from app.models.user import UserInDB, User, UserResponse
 from app.models.product import ProductInDB, Product
 from app.services.user_service import UserService
 from app.services.product_service import ProductService
@@ -69,7 +69,7 @@ class AdminService:
             low_stock_products=low_stock_products
         )
 
-    async def get_all_users(self, skip: int = 0, limit: int = 50) -> List[UserInDB]:
+    async def get_all_users(self, skip: int = 0, limit: int = 50) -> List[User]:
         """Get all users with pagination"""
         return await self.user_service.get_all_users(skip=skip, limit=limit)
 
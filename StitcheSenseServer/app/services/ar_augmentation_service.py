@@ -5,13 +5,7 @@ Real-time dress fitting and augmentation using computer vision
 
 import cv2
 import numpy as np
-try:
-    import tensorflow as tf
-    import tensorflow_hub as hub
-    TENSORFLOW_AVAILABLE = True
-except ImportError:
-    TENSORFLOW_AVAILABLE = False
-    
+import importlib.util
 import mediapipe as mp
 from typing import Dict, Any, Tuple, Optional, List
 import base64
@@ -20,29 +14,145 @@ from PIL import Image, ImageDraw
 import json
 import asyncio
 import logging
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Capability check only - TensorFlow itself is imported on demand
+TENSORFLOW_INSTALLED = importlib.util.find_spec("tensorflow") is not None
+
+# This module hosts the server's per-frame OpenCV work, so it sizes OpenCV's
+# (process-wide) thread pool; keeping it small avoids contention with the event
+# loop, concurrency comes from asyncio tasks and worker processes instead
+cv2.setNumThreads(settings.OPENCV_THREADS)
+
+
+# Static dress templates, built once at import and copied out per request
+_TEMPLATES: Tuple[Dict[str, Any], ...] = (
+    {
+        'id': 'evening_gown_classic',
+        'name': 'Classic Evening Gown',
+        'type': 'evening_gown',
+        'description': 'Elegant floor-length evening gown',
+        'config': {
+            'bodice_color': (75, 0, 130),  # Indigo
+            'skirt_color': (123, 104, 238),  # Medium slate blue
+            'opacity': 0.7
+        }
+    },
+    {
+        'id': 'wedding_dress_ball',
+        'name': 'Ball Gown Wedding Dress',
+        'type': 'wedding_dress',
+        'description': 'Traditional white ball gown with veil',
+        'config': {
+            'include_veil': True,
+            'opacity': 0.8
+        }
+    },
+    {
+        'id': 'cocktail_dress_black',
+        'name': 'Little Black Dress',
+        'type': 'cocktail_dress',
+        'description': 'Classic black cocktail dress',
+        'config': {
+            'dress_color': (0, 0, 0),
+            'opacity': 0.75
+        }
+    },
+    {
+        'id': 'formal_gown_purple',
+        'name': 'Purple Formal Gown',
+        'type': 'formal_gown',
+        'description': 'Elegant purple formal gown',
+        'config': {
+            'bodice_color': (128, 0, 128),
+            'skirt_color': (138, 43, 226),
+            'opacity': 0.7
+        }
+    }
+)
+
+_TEMPLATE_BY_ID: Dict[str, Dict[str, Any]] = {t['id']: t for t in _TEMPLATES}
+
+# MediaPipe pose landmark indices used by the garment renderers
+NOSE = 0
+LEFT_SHOULDER, RIGHT_SHOULDER = 11, 12
+LEFT_HIP, RIGHT_HIP = 23, 24
+LEFT_KNEE, RIGHT_KNEE = 25, 26
+LEFT_ANKLE, RIGHT_ANKLE = 27, 28
+
+# Garment polygons as (landmark indices, per-vertex pixel offsets): a frame's
+# polygon is pose_points[IDX] + OFFSET, a single vectorized int32 add.
+_EVENING_BODICE_IDX = np.array([LEFT_SHOULDER, RIGHT_SHOULDER, RIGHT_HIP, LEFT_HIP])
+_EVENING_BODICE_OFFSET = np.array([[0, 0], [0, 0], [20, 0], [-20, 0]], np.int32)
+_EVENING_SKIRT_IDX = np.array([LEFT_HIP, RIGHT_HIP, RIGHT_KNEE, LEFT_KNEE])
+_EVENING_SKIRT_OFFSET = np.array([[-20, 0], [20, 0], [0, 100], [0, 100]], np.int32)
+
+_WEDDING_BODICE_IDX = np.array([LEFT_SHOULDER, RIGHT_SHOULDER, RIGHT_HIP, LEFT_HIP])
+_WEDDING_BODICE_OFFSET = np.array([[0, 30], [0, 30], [15, -20], [-15, -20]], np.int32)
+_WEDDING_SKIRT_IDX = np.array([LEFT_HIP, RIGHT_HIP, LEFT_HIP, LEFT_HIP])
+_WEDDING_SKIRT_OFFSET = np.array([[-15, -20], [15, -20], [0, 200], [0, 200]], np.int32)
+_WEDDING_VEIL_IDX = np.array([NOSE, NOSE, RIGHT_SHOULDER, LEFT_SHOULDER])
+_WEDDING_VEIL_OFFSET = np.array([[-80, -30], [80, -30], [40, 60], [-40, 60]], np.int32)
+
+_COCKTAIL_DRESS_IDX = np.array([LEFT_SHOULDER, RIGHT_SHOULDER, RIGHT_HIP, LEFT_HIP])
+_COCKTAIL_DRESS_OFFSET = np.array([[0, 0], [0, 0], [25, 80], [-25, 80]], np.int32)
+
+_FORMAL_BODICE_IDX = np.array([LEFT_SHOULDER, RIGHT_SHOULDER, RIGHT_SHOULDER, LEFT_SHOULDER])
+_FORMAL_BODICE_OFFSET = np.array([[0, 0], [0, 0], [0, 60], [0, 60]], np.int32)
+_FORMAL_SKIRT_IDX = np.array([LEFT_SHOULDER, RIGHT_SHOULDER, RIGHT_ANKLE, LEFT_ANKLE])
+_FORMAL_SKIRT_OFFSET = np.array([[0, 60], [0, 60], [30, 0], [-30, 0]], np.int32)
+
+# Direction each hem vertex is pushed by a pose-dependent skirt width
+_HEM_FLARE = np.array([[0, 0], [0, 0], [1, 0], [-1, 0]], np.int32)
+
 
 class ARDressAugmentationService:
     """AR Dress Augmentation Service using MediaPipe and OpenCV"""
     
-    def __init__(self):
+    # Fixed garment colors (BGR), shared by every frame instead of rebuilt per call.
+    # Overlapping polygons stay in separate fillPoly calls: a single call fills
+    # them even-odd, which would punch holes where e.g. the veil meets the bodice.
+    _WEDDING_WHITE = (255, 255, 255)
+    _WEDDING_OFF_WHITE = (250, 250, 250)
+    _COCKTAIL_DEFAULT_COLOR = (0, 0, 0)  # Black cocktail dress
+    _FORMAL_DEFAULT_BODICE = (128, 0, 128)
+    _FORMAL_DEFAULT_SKIRT = (138, 43, 226)
+    
+    # Video-rate preview frames: quality 70 is visually indistinguishable at this
+    # size and much smaller than OpenCV's default of 95
+    _JPEG_PARAMS = [
+        int(cv2.IMWRITE_JPEG_QUALITY), 70,
+        int(cv2.IMWRITE_JPEG_PROGRESSIVE), 0,
+        int(cv2.IMWRITE_JPEG_OPTIMIZE), 0
+    ]
+    _DATA_URI_PREFIX = "data:image/jpeg;base64,"
+    
+    def __init__(self, enable_tensorflow: bool = False):
+        # Realtime path: the full (complexity 1) model is accurate enough for
+        # garment placement, and no renderer consumes a segmentation mask
         self.pose_detector = mp.solutions.pose.Pose(
             static_image_mode=False,
-            model_complexity=2,
-            enable_segmentation=True,
+            model_complexity=1,
+            enable_segmentation=False,
+            smooth_landmarks=True,
             min_detection_confidence=0.5,
             min_tracking_confidence=0.5
         )
         
         # TensorFlow models (optional)
-        self.tensorflow_available = TENSORFLOW_AVAILABLE
-        if TENSORFLOW_AVAILABLE:
-            logger.info("TensorFlow available - enhanced AR features enabled")
-            self._load_tensorflow_models()
+        # Only True once a TensorFlow runtime has actually been loaded
+        self.tensorflow_available = False
+        if TENSORFLOW_INSTALLED:
+            if enable_tensorflow:
+                self._load_tensorflow_models()
+                if self.tensorflow_available:
+                    logger.info("TensorFlow available - enhanced AR features enabled")
+            else:
+                logger.info("TensorFlow installed but not enabled - using MediaPipe only")
         else:
-            logger.info("TensorFlow not available - using MediaPipe only")
+            logger.info("TensorFlow not installed - using MediaPipe only")
         
         # Pose landmarks for dress fitting
         self.dress_landmarks = {
@@ -61,15 +171,31 @@ class ARDressAugmentationService:
             'sleeves': (221, 160, 221), # Plum
             'overlay': (255, 255, 255, 128)  # Semi-transparent white
         }
+        
+        # Scratch buffer reused by the renderers, resized lazily to the frame
+        self._overlay_buf: Optional[np.ndarray] = None
+        
+        # Dress type -> renderer
+        self._dress_dispatch = {
+            'evening_gown': self._apply_evening_gown,
+            'wedding_dress': self._apply_wedding_dress,
+            'cocktail_dress': self._apply_cocktail_dress,
+            'formal_gown': self._apply_formal_gown
+        }
     
     def _load_tensorflow_models(self):
         """Load pre-trained TensorFlow models for advanced processing (optional)"""
-        if not TENSORFLOW_AVAILABLE:
+        if not TENSORFLOW_INSTALLED:
             return
             
         try:
+            # Imported for their side effect of initializing the runtimes
+            importlib.import_module("tensorflow")
+            importlib.import_module("tensorflow_hub")
+            
             # Note: Simplified for now - can be extended later
             logger.info("TensorFlow models setup ready (models will be loaded on demand)")
+            self.tensorflow_available = True
         except Exception as e:
             logger.warning(f"Failed to setup TensorFlow models: {e}")
             self.tensorflow_available = False
@@ -86,7 +212,7 @@ class ARDressAugmentationService:
             Dictionary containing augmented frame and metadata
         """
         try:
-            logger.info(f"Starting frame processing: frame_data_size={len(frame_data)}, dress_config={dress_config}")
+            logger.debug("Starting frame processing: frame_data_size=%d, dress_config=%s", len(frame_data), dress_config)
             
             # Decode image
             nparr = np.frombuffer(frame_data, np.uint8)
@@ -96,7 +222,7 @@ class ARDressAugmentationService:
                 logger.error("Failed to decode frame data")
                 raise ValueError("Invalid frame data")
             
-            logger.info(f"Frame decoded successfully: shape={frame.shape}")
+            logger.debug("Frame decoded successfully: shape=%s", frame.shape)
             
             # Resize frame for faster processing (optional, can be configured)
             original_height, original_width = frame.shape[:2]
@@ -107,45 +233,47 @@ class ARDressAugmentationService:
                 new_height = int(original_height * scale)
                 frame_resized = cv2.resize(frame, (new_width, new_height))
                 scale_factor = scale
-                logger.info(f"Frame resized from {original_width}x{original_height} to {new_width}x{new_height}")
+                logger.debug("Frame resized from %dx%d to %dx%d", original_width, original_height, new_width, new_height)
             else:
+                new_width, new_height = original_width, original_height
                 frame_resized = frame
                 scale_factor = 1.0
-                logger.info("Frame size within limits, no resizing needed")
+                logger.debug("Frame size within limits, no resizing needed")
             
             # Get pose landmarks
-            logger.info("Starting pose detection")
+            logger.debug("Starting pose detection")
             pose_results = await self._detect_pose(frame_resized)
             
             if not pose_results.pose_landmarks:
-                logger.warning("No pose detected in frame")
+                logger.debug("No pose detected in frame")
                 return {
                     'success': False,
                     'message': 'No pose detected',
-                    'frame': self._encode_frame(frame),
+                    'frame': self._encode_frame(frame_resized),
+                    'original_size': [original_width, original_height],
+                    'render_size': [new_width, new_height],
                     'processing_time': 0
                 }
             
-            logger.info("Pose detected successfully, applying dress augmentation")
+            logger.debug("Pose detected successfully, applying dress augmentation")
             
             # Apply dress augmentation
             augmented_frame = await self._apply_dress_augmentation(
                 frame_resized, pose_results, dress_config
             )
             
-            # Scale back to original size if needed
-            if scale_factor != 1.0:
-                augmented_frame = cv2.resize(augmented_frame, (original_width, original_height))
-                logger.info("Frame scaled back to original size")
+            # The frame is returned at render resolution; the client scales it for display
             
             # Get body measurements for fitting (use original frame for accuracy)
             measurements = await self._calculate_measurements(pose_results, frame_resized.shape, scale_factor)
-            logger.info(f"Measurements calculated: {measurements}")
+            logger.debug("Measurements calculated: %s", measurements)
             
-            logger.info("Frame processing completed successfully")
+            logger.debug("Frame processing completed successfully")
             return {
                 'success': True,
                 'frame': self._encode_frame(augmented_frame),
+                'original_size': [original_width, original_height],
+                'render_size': [new_width, new_height],
                 'measurements': measurements,
                 'pose_confidence': pose_results.pose_landmarks.landmark[0].visibility,
                 'dress_config': dress_config,
@@ -153,9 +281,7 @@ class ARDressAugmentationService:
             }
             
         except Exception as e:
-            logger.error(f"Error in AR processing: {e}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
+            logger.exception("Error in AR processing")
             return {
                 'success': False,
                 'message': f'Processing error: {str(e)}',
@@ -169,179 +295,112 @@ class ARDressAugmentationService:
         return self.pose_detector.process(rgb_frame)
     
     async def _apply_dress_augmentation(self, frame: np.ndarray, pose_results, dress_config: Dict[str, Any]) -> np.ndarray:
-        """Apply dress augmentation to the frame"""
-        augmented_frame = frame.copy()
+        """Apply dress augmentation to the frame (renders in place; the frame is per-request)"""
         landmarks = pose_results.pose_landmarks.landmark
         
         h, w, _ = frame.shape
         
-        # Convert normalized coordinates to pixel coordinates
-        pose_points = {}
-        for i, landmark in enumerate(landmarks):
-            pose_points[i] = (int(landmark.x * w), int(landmark.y * h))
+        # Convert normalized coordinates to pixel coordinates, one (x, y) row per landmark
+        pose_points = (
+            np.array([(landmark.x, landmark.y) for landmark in landmarks]) * (w, h)
+        ).astype(np.int32)
         
         # Apply different dress types
         dress_type = dress_config.get('type', 'evening_gown')
         
-        if dress_type == 'evening_gown':
-            augmented_frame = await self._apply_evening_gown(augmented_frame, pose_points, dress_config)
-        elif dress_type == 'wedding_dress':
-            augmented_frame = await self._apply_wedding_dress(augmented_frame, pose_points, dress_config)
-        elif dress_type == 'cocktail_dress':
-            augmented_frame = await self._apply_cocktail_dress(augmented_frame, pose_points, dress_config)
-        elif dress_type == 'formal_gown':
-            augmented_frame = await self._apply_formal_gown(augmented_frame, pose_points, dress_config)
+        handler = self._dress_dispatch.get(dress_type)
+        if handler:
+            frame = await handler(frame, pose_points, dress_config)
         
-        return augmented_frame
+        return frame
     
-    async def _apply_evening_gown(self, frame: np.ndarray, pose_points: Dict, config: Dict) -> np.ndarray:
+    def _get_overlay(self, frame: np.ndarray) -> np.ndarray:
+        """Copy frame into the reusable overlay buffer and return it"""
+        if self._overlay_buf is None or self._overlay_buf.shape != frame.shape:
+            self._overlay_buf = np.empty_like(frame)
+        np.copyto(self._overlay_buf, frame)
+        return self._overlay_buf
+    
+    @staticmethod
+    def _shoulder_span(pose_points: np.ndarray) -> int:
+        """Horizontal distance between the shoulders in pixels"""
+        return abs(int(pose_points[RIGHT_SHOULDER, 0]) - int(pose_points[LEFT_SHOULDER, 0]))
+    
+    async def _apply_evening_gown(self, frame: np.ndarray, pose_points: np.ndarray, config: Dict) -> np.ndarray:
         """Apply evening gown augmentation"""
-        overlay = frame.copy()
-        
-        # Get key points
-        left_shoulder = pose_points.get(11)
-        right_shoulder = pose_points.get(12)
-        left_hip = pose_points.get(23)
-        right_hip = pose_points.get(24)
-        left_knee = pose_points.get(25)
-        right_knee = pose_points.get(26)
-        
-        if all([left_shoulder, right_shoulder, left_hip, right_hip]):
-            # Draw bodice (fitted top)
-            bodice_points = np.array([
-                left_shoulder,
-                right_shoulder,
-                (right_hip[0] + 20, right_hip[1]),
-                (left_hip[0] - 20, left_hip[1])
-            ], np.int32)
-            
-            color = config.get('bodice_color', self.color_map['bodice'])
-            cv2.fillPoly(overlay, [bodice_points], color)
-            
-            # Draw flowing skirt
-            if left_knee and right_knee:
-                skirt_width = int(abs(right_shoulder[0] - left_shoulder[0]) * 2.5)
-                skirt_points = np.array([
-                    (left_hip[0] - 20, left_hip[1]),
-                    (right_hip[0] + 20, right_hip[1]),
-                    (right_knee[0] + skirt_width//2, right_knee[1] + 100),
-                    (left_knee[0] - skirt_width//2, left_knee[1] + 100)
-                ], np.int32)
-                
-                skirt_color = config.get('skirt_color', self.color_map['skirt'])
-                cv2.fillPoly(overlay, [skirt_points], skirt_color)
+        overlay = self._get_overlay(frame)
+        
+        # Draw bodice (fitted top)
+        bodice_points = pose_points[_EVENING_BODICE_IDX] + _EVENING_BODICE_OFFSET
+        color = config.get('bodice_color', self.color_map['bodice'])
+        cv2.fillPoly(overlay, [bodice_points], color)
+        
+        # Draw flowing skirt, flared by 2.5x the shoulder width at the hem
+        skirt_width = int(self._shoulder_span(pose_points) * 2.5)
+        skirt_points = (
+            pose_points[_EVENING_SKIRT_IDX] + _EVENING_SKIRT_OFFSET
+            + (skirt_width // 2) * _HEM_FLARE
+        )
+        skirt_color = config.get('skirt_color', self.color_map['skirt'])
+        cv2.fillPoly(overlay, [skirt_points], skirt_color)
         
         # Blend with original frame
         alpha = config.get('opacity', 0.7)
-        return cv2.addWeighted(frame, 1 - alpha, overlay, alpha, 0)
+        cv2.addWeighted(frame, 1 - alpha, overlay, alpha, 0, dst=frame)
+        return frame
     
-    async def _apply_wedding_dress(self, frame: np.ndarray, pose_points: Dict, config: Dict) -> np.ndarray:
+    async def _apply_wedding_dress(self, frame: np.ndarray, pose_points: np.ndarray, config: Dict) -> np.ndarray:
         """Apply wedding dress augmentation with train and veil"""
-        overlay = frame.copy()
-        
-        # Get key points
-        left_shoulder = pose_points.get(11)
-        right_shoulder = pose_points.get(12)
-        left_hip = pose_points.get(23)
-        right_hip = pose_points.get(24)
-        nose = pose_points.get(0)
-        
-        if all([left_shoulder, right_shoulder, left_hip, right_hip]):
-            # Draw fitted bodice with sweetheart neckline
-            bodice_points = np.array([
-                (left_shoulder[0], left_shoulder[1] + 30),  # Lower neckline
-                (right_shoulder[0], right_shoulder[1] + 30),
-                (right_hip[0] + 15, right_hip[1] - 20),
-                (left_hip[0] - 15, left_hip[1] - 20)
-            ], np.int32)
-            
-            cv2.fillPoly(overlay, [bodice_points], (255, 255, 255))  # White
-            
-            # Draw full ball gown skirt
-            skirt_width = int(abs(right_shoulder[0] - left_shoulder[0]) * 3)
-            center_x = (left_hip[0] + right_hip[0]) // 2
-            skirt_points = np.array([
-                (left_hip[0] - 15, left_hip[1] - 20),
-                (right_hip[0] + 15, right_hip[1] - 20),
-                (center_x + skirt_width//2, left_hip[1] + 200),
-                (center_x - skirt_width//2, left_hip[1] + 200)
-            ], np.int32)
-            
-            cv2.fillPoly(overlay, [skirt_points], (250, 250, 250))  # Off-white
-            
-            # Add veil if configured
-            if config.get('include_veil', True) and nose:
-                veil_points = np.array([
-                    (nose[0] - 80, nose[1] - 30),
-                    (nose[0] + 80, nose[1] - 30),
-                    (right_shoulder[0] + 40, right_shoulder[1] + 60),
-                    (left_shoulder[0] - 40, left_shoulder[1] + 60)
-                ], np.int32)
-                
-                cv2.fillPoly(overlay, [veil_points], (255, 255, 255, 100))  # Transparent white
+        overlay = self._get_overlay(frame)
+        
+        # Draw fitted bodice with sweetheart neckline
+        bodice_points = pose_points[_WEDDING_BODICE_IDX] + _WEDDING_BODICE_OFFSET
+        cv2.fillPoly(overlay, [bodice_points], self._WEDDING_WHITE)
+        
+        # Draw full ball gown skirt, hem centered between the hips
+        skirt_width = int(self._shoulder_span(pose_points) * 3)
+        center_x = (int(pose_points[LEFT_HIP, 0]) + int(pose_points[RIGHT_HIP, 0])) // 2
+        skirt_points = pose_points[_WEDDING_SKIRT_IDX] + _WEDDING_SKIRT_OFFSET
+        skirt_points[2:, 0] = center_x + (skirt_width // 2) * _HEM_FLARE[2:, 0]
+        cv2.fillPoly(overlay, [skirt_points], self._WEDDING_OFF_WHITE)
+        
+        # Add veil if configured
+        if config.get('include_veil', True):
+            veil_points = pose_points[_WEDDING_VEIL_IDX] + _WEDDING_VEIL_OFFSET
+            cv2.fillPoly(overlay, [veil_points], self._WEDDING_WHITE)
         
         alpha = config.get('opacity', 0.8)
-        return cv2.addWeighted(frame, 1 - alpha, overlay, alpha, 0)
+        cv2.addWeighted(frame, 1 - alpha, overlay, alpha, 0, dst=frame)
+        return frame
     
-    async def _apply_cocktail_dress(self, frame: np.ndarray, pose_points: Dict, config: Dict) -> np.ndarray:
+    async def _apply_cocktail_dress(self, frame: np.ndarray, pose_points: np.ndarray, config: Dict) -> np.ndarray:
         """Apply cocktail dress augmentation (shorter, fitted)"""
-        overlay = frame.copy()
-        
-        left_shoulder = pose_points.get(11)
-        right_shoulder = pose_points.get(12)
-        left_hip = pose_points.get(23)
-        right_hip = pose_points.get(24)
-        
-        if all([left_shoulder, right_shoulder, left_hip, right_hip]):
-            # Fitted dress ending above knee
-            dress_points = np.array([
-                left_shoulder,
-                right_shoulder,
-                (right_hip[0] + 25, right_hip[1] + 80),
-                (left_hip[0] - 25, left_hip[1] + 80)
-            ], np.int32)
-            
-            color = config.get('dress_color', (0, 0, 0))  # Black cocktail dress
-            cv2.fillPoly(overlay, [dress_points], color)
+        overlay = self._get_overlay(frame)
+        
+        # Fitted dress ending above knee
+        dress_points = pose_points[_COCKTAIL_DRESS_IDX] + _COCKTAIL_DRESS_OFFSET
+        color = config.get('dress_color', self._COCKTAIL_DEFAULT_COLOR)
+        cv2.fillPoly(overlay, [dress_points], color)
         
         alpha = config.get('opacity', 0.75)
-        return cv2.addWeighted(frame, 1 - alpha, overlay, alpha, 0)
+        cv2.addWeighted(frame, 1 - alpha, overlay, alpha, 0, dst=frame)
+        return frame
     
-    async def _apply_formal_gown(self, frame: np.ndarray, pose_points: Dict, config: Dict) -> np.ndarray:
+    async def _apply_formal_gown(self, frame: np.ndarray, pose_points: np.ndarray, config: Dict) -> np.ndarray:
         """Apply formal gown with elegant draping"""
-        overlay = frame.copy()
-        
-        left_shoulder = pose_points.get(11)
-        right_shoulder = pose_points.get(12)
-        left_hip = pose_points.get(23)
-        right_hip = pose_points.get(24)
-        left_ankle = pose_points.get(27)
-        right_ankle = pose_points.get(28)
-        
-        if all([left_shoulder, right_shoulder, left_hip, right_hip]):
-            # Empire waist design
-            bodice_points = np.array([
-                left_shoulder,
-                right_shoulder,
-                (right_shoulder[0], right_shoulder[1] + 60),
-                (left_shoulder[0], left_shoulder[1] + 60)
-            ], np.int32)
-            
-            cv2.fillPoly(overlay, [bodice_points], config.get('bodice_color', (128, 0, 128)))
-            
-            # Flowing skirt to ankles
-            if left_ankle and right_ankle:
-                skirt_points = np.array([
-                    (left_shoulder[0], left_shoulder[1] + 60),
-                    (right_shoulder[0], right_shoulder[1] + 60),
-                    (right_ankle[0] + 30, right_ankle[1]),
-                    (left_ankle[0] - 30, left_ankle[1])
-                ], np.int32)
-                
-                cv2.fillPoly(overlay, [skirt_points], config.get('skirt_color', (138, 43, 226)))
+        overlay = self._get_overlay(frame)
+        
+        # Empire waist design
+        bodice_points = pose_points[_FORMAL_BODICE_IDX] + _FORMAL_BODICE_OFFSET
+        cv2.fillPoly(overlay, [bodice_points], config.get('bodice_color', self._FORMAL_DEFAULT_BODICE))
+        
+        # Flowing skirt to ankles
+        skirt_points = pose_points[_FORMAL_SKIRT_IDX] + _FORMAL_SKIRT_OFFSET
+        cv2.fillPoly(overlay, [skirt_points], config.get('skirt_color', self._FORMAL_DEFAULT_SKIRT))
         
         alpha = config.get('opacity', 0.7)
-        return cv2.addWeighted(frame, 1 - alpha, overlay, alpha, 0)
+        cv2.addWeighted(frame, 1 - alpha, overlay, alpha, 0, dst=frame)
+        return frame
     
     async def _calculate_measurements(self, pose_results, frame_shape: Tuple[int, int, int], scale_factor: float = 1.0) -> Dict[str, float]:
         """Calculate body measurements from pose landmarks with scale compensation"""
@@ -382,61 +441,17 @@ class ARDressAugmentationService:
     
     def _encode_frame(self, frame: np.ndarray) -> str:
         """Encode frame to base64 string"""
-        _, buffer = cv2.imencode('.jpg', frame)
-        encoded_frame = base64.b64encode(buffer).decode('utf-8')
-        return f"data:image/jpeg;base64,{encoded_frame}"
+        _, buffer = cv2.imencode('.jpg', frame, self._JPEG_PARAMS)
+        encoded_frame = base64.b64encode(memoryview(buffer)).decode('ascii')
+        return self._DATA_URI_PREFIX + encoded_frame
     
     async def get_dress_templates(self) -> List[Dict[str, Any]]:
         """Get available dress templates and configurations"""
-        return [
-            {
-                'id': 'evening_gown_classic',
-                'name': 'Classic Evening Gown',
-                'type': 'evening_gown',
-                'description': 'Elegant floor-length evening gown',
-                'config': {
-                    'bodice_color': (75, 0, 130),  # Indigo
-                    'skirt_color': (123, 104, 238),  # Medium slate blue
-                    'opacity': 0.7
-                }
-            },
-            {
-                'id': 'wedding_dress_ball',
-                'name': 'Ball Gown Wedding Dress',
-                'type': 'wedding_dress',
-                'description': 'Traditional white ball gown with veil',
-                'config': {
-                    'include_veil': True,
-                    'opacity': 0.8
-                }
-            },
-            {
-                'id': 'cocktail_dress_black',
-                'name': 'Little Black Dress',
-                'type': 'cocktail_dress',
-                'description': 'Classic black cocktail dress',
-                'config': {
-                    'dress_color': (0, 0, 0),
-                    'opacity': 0.75
-                }
-            },
-            {
-                'id': 'formal_gown_purple',
-                'name': 'Purple Formal Gown',
-                'type': 'formal_gown',
-                'description': 'Elegant purple formal gown',
-                'config': {
-                    'bodice_color': (128, 0, 128),
-                    'skirt_color': (138, 43, 226),
-                    'opacity': 0.7
-                }
-            }
-        ]
+        return [{**t, 'config': dict(t['config'])} for t in _TEMPLATES]
     
     async def customize_dress(self, template_id: str, customizations: Dict[str, Any]) -> Dict[str, Any]:
         """Customize a dress template with user preferences"""
-        templates = await self.get_dress_templates()
-        template = next((t for t in templates if t['id'] == template_id), None)
+        template = _TEMPLATE_BY_ID.get(template_id)
         
         if not template:
             raise ValueError(f"Template {template_id} not found")
@@ -1,17 +1,44 @@
 from typing import Optional, List, Dict, Any
 from bson import ObjectId
+from pymongo import ReturnDocument
 from datetime import datetime
 from app.core.database import get_database
 from app.models.product import ProductCreate, ProductUpdate, ProductInDB, Product, GownCategory
 
+# Only the fields the Product model declares, so legacy/extra document fields stay server-side
+_PRODUCT_PROJECTION = {
+    (field.alias or name): 1 for name, field in Product.model_fields.items()
+}
+
 class ProductService:
     def __init__(self):
         self.collection_name = "products"
+        self._collection = None
     
     async def get_collection(self):
-        """Get products collection"""
-        db = await get_database()
-        return db[self.collection_name]
+        """Get products collection (looked up once, then reused)"""
+        if self._collection is None:
+            db = await get_database()
+            self._collection = db[self.collection_name]
+        return self._collection
+    
+    async def ensure_indexes(self):
+        """Create the indexes backing product listing and search queries"""
+        collection = await self.get_collection()
+        
+        # MongoDB allows a single text index per collection, so replace an older
+        # one (e.g. db_init's name/description index) instead of conflicting with it
+        text_keys = [("name", "text"), ("description", "text"), ("fabric", "text"), ("color", "text")]
+        text_index_name = "_".join(f"{field}_text" for field, _ in text_keys)
+        indexes = await collection.index_information()
+        for name, info in indexes.items():
+            if name != text_index_name and any(kind == "text" for _, kind in info["key"]):
+                await collection.drop_index(name)
+        await collection.create_index(text_keys, name=text_index_name)
+        await collection.create_index([("is_active", 1), ("_id", 1)])
+        await collection.create_index([("is_active", 1), ("category", 1)])
+        await collection.create_index([("is_featured", 1), ("is_active", 1)])
+        await collection.create_index([("stock_quantity", 1), ("is_active", 1)])
     
     async def create_product(self, product_data: ProductCreate) -> ProductInDB:
         """Create a new product"""
@@ -26,6 +53,19 @@ class ProductService:
         
         return product_doc
     
+    async def bulk_create_products(self, products: List[ProductCreate]) -> List[ProductInDB]:
+        """Create several products with a single insert"""
+        collection = await self.get_collection()
+        
+        product_docs = [ProductInDB(**product_data.dict()) for product_data in products]
+        if product_docs:
+            await collection.insert_many(
+                [product_doc.dict(by_alias=True) for product_doc in product_docs],
+                ordered=False
+            )
+        
+        return product_docs
+    
     async def get_product_by_id(self, product_id: str) -> Optional[Product]:
         """Get product by ID"""
         collection = await self.get_collection()
@@ -44,13 +84,14 @@ class ProductService:
         if update_data:
             update_data["updated_at"] = datetime.utcnow()
             
-            result = await collection.update_one(
+            product_doc = await collection.find_one_and_update(
                 {"_id": ObjectId(product_id)},
-                {"$set": update_data}
+                {"$set": update_data},
+                return_document=ReturnDocument.AFTER
             )
             
-            if result.modified_count:
-                return await self.get_product_by_id(product_id)
+            if product_doc:
+                return Product(**product_doc)
         
         return None
     
@@ -66,9 +107,14 @@ class ProductService:
         limit: int = 100,
         category: Optional[GownCategory] = None,
         is_active: bool = True,
-        is_featured: Optional[bool] = None
+        is_featured: Optional[bool] = None,
+        after_id: Optional[str] = None
     ) -> List[Product]:
-        """Get all products with filtering and pagination"""
+        """Get all products with filtering and pagination
+        
+        Pass the id of the last product of the previous page as ``after_id``
+        to page by ``_id`` instead of skipping documents server-side.
+        """
         collection = await self.get_collection()
         
         # Build filter
@@ -80,7 +126,12 @@ class ProductService:
         if is_featured is not None:
             filter_query["is_featured"] = is_featured
         
-        cursor = collection.find(filter_query).skip(skip).limit(limit)
+        if after_id:
+            filter_query["_id"] = {"$gt": ObjectId(after_id)}
+        
+        cursor = collection.find(filter_query, _PRODUCT_PROJECTION).sort(
+            [("_id", 1)]
+        ).skip(skip).limit(limit)
         products = await cursor.to_list(length=limit)
         
         return [Product(**product) for product in products]
@@ -94,22 +145,15 @@ class ProductService:
         """Search products by name or description"""
         collection = await self.get_collection()
         
-        # Create text search query
+        # Text index search over name, description, fabric and color
         filter_query = {
-            "$and": [
-                {"is_active": True},
-                {
-                    "$or": [
-                        {"name": {"$regex": search_term, "$options": "i"}},
-                        {"description": {"$regex": search_term, "$options": "i"}},
-                        {"fabric": {"$regex": search_term, "$options": "i"}},
-                        {"color": {"$regex": search_term, "$options": "i"}}
-                    ]
-                }
-            ]
+            "is_active": True,
+            "$text": {"$search": search_term}
         }
         
-        cursor = collection.find(filter_query).skip(skip).limit(limit)
+        cursor = collection.find(filter_query, _PRODUCT_PROJECTION).sort(
+            [("score", {"$meta": "textScore"})]
+        ).skip(skip).limit(limit)
         products = await cursor.to_list(length=limit)
         
         return [Product(**product) for product in products]
@@ -117,7 +161,10 @@ class ProductService:
     async def get_products_by_category(self, category: GownCategory) -> List[Product]:
         """Get products by category"""
         collection = await self.get_collection()
-        cursor = collection.find({"category": category.value, "is_active": True})
+        cursor = collection.find(
+            {"category": category.value, "is_active": True},
+            _PRODUCT_PROJECTION
+        )
         products = await cursor.to_list(length=None)
         
         return [Product(**product) for product in products]
@@ -128,7 +175,7 @@ class ProductService:
         cursor = collection.find({
             "is_featured": True, 
             "is_active": True
-        }).limit(limit)
+        }, _PRODUCT_PROJECTION).limit(limit)
         products = await cursor.to_list(length=limit)
         
         return [Product(**product) for product in products]
@@ -166,14 +213,7 @@ class ProductService:
             "is_active": True
         }
         
-        cursor = collection.find(filter_query)
+        cursor = collection.find(filter_query, _PRODUCT_PROJECTION)
         products = await cursor.to_list(length=None)
         
         return [Product(**product) for product in products]
-
-    async def delete_product(self, product_id: str) -> bool:
-        """Delete product by ID"""
-        collection = await self.get_collection()
-        
-        result = await collection.delete_one({"_id": ObjectId(product_id)})
-        return result.deleted_count > 0
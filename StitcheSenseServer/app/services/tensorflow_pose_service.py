@@ -12,14 +12,43 @@ except ImportError:
     tf = None
     hub = None
 
+import asyncio
+import threading
 import numpy as np
 import cv2
+import os
+import json
+import subprocess
+import tempfile
+import urllib.request
 from typing import Dict, Any, Tuple, List, Optional
 import logging
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
+try:
+    with open(os.path.join(os.path.dirname(__file__), "..", "core", "ar_config.json")) as f:
+        AR_CONFIG = json.load(f)
+except FileNotFoundError:
+    # Written by install_ar.py; without it TensorFlow keeps its default GPU allocator
+    AR_CONFIG = {}
+
+MOVENET_SAVEDMODEL_URL = "https://tfhub.dev/google/movenet/singlepose/lightning/4"
+
+# TFLite builds of MoveNet Lightning, selected with MOVENET_BACKEND
+MOVENET_TFLITE_URLS = {
+    "tflite_float16": "https://tfhub.dev/google/lite-model/movenet/singlepose/lightning/tflite/float16/4?lite-format=tflite",
+    "tflite_int8": "https://tfhub.dev/google/lite-model/movenet/singlepose/lightning/tflite/int8/4?lite-format=tflite",
+}
+
+# ONNX Runtime providers in order of preference; unavailable ones are skipped
+ONNX_PROVIDERS = [
+    ("TensorrtExecutionProvider", {"trt_fp16_enable": True}),
+    "CUDAExecutionProvider",
+    "CPUExecutionProvider",
+]
+
 
 @dataclass
 class PoseKeypoint:
@@ -32,18 +61,38 @@ class PoseKeypoint:
 @dataclass
 class PoseEstimation:
     """Complete pose estimation result"""
-    keypoints: List[PoseKeypoint]
+    keypoints_xy: np.ndarray  # (K, 2) int32 pixel coordinates
+    keypoints_conf: np.ndarray  # (K,) float32 confidences
     overall_confidence: float
     bounding_box: Tuple[int, int, int, int]  # x, y, width, height
     person_segmentation: Optional[np.ndarray] = None
+    
+    @property
+    def keypoints(self) -> List[PoseKeypoint]:
+        """Keypoints as PoseKeypoint objects (built on access)"""
+        return [
+            PoseKeypoint(x, y, confidence)
+            for (x, y), confidence in zip(self.keypoints_xy.tolist(), self.keypoints_conf.tolist())
+        ]
 
 
 class TensorFlowPoseEstimator:
     """Advanced pose estimation using TensorFlow models (optional)"""
     
-    def __init__(self):
+    def __init__(self, movenet_backend: Optional[str] = None):
         self.models_loaded = False
+        # "savedmodel" (TF Hub), "tflite_float16", "tflite_int8" or "onnx"
+        self.movenet_backend = movenet_backend or os.getenv("MOVENET_BACKEND", "savedmodel")
         self.movenet_model = None
+        self._movenet_infer = None
+        self._movenet_infer_batch = None
+        self._tflite_interpreter = None
+        self._tflite_input = None
+        self._tflite_output = None
+        self._onnx_session = None
+        self._onnx_input_name = None
+        # TFLite interpreters are not thread-safe, and the runtime path shares _pre_buf
+        self._runtime_lock = threading.Lock()
         self.posenet_model = None
         self.body_pix_model = None
         self.tensorflow_available = TENSORFLOW_AVAILABLE
@@ -56,6 +105,32 @@ class TensorFlowPoseEstimator:
             'left_knee', 'right_knee', 'left_ankle', 'right_ankle'
         ]
         
+        # MediaPipe has 33 landmarks, TensorFlow (MoveNet) has 17
+        # Map common landmarks (MediaPipe index -> MoveNet index) for fusion
+        common_landmarks = {
+            0: 0,   # nose
+            5: 1,   # left_shoulder -> left_eye (approximate)
+            6: 2,   # right_shoulder -> right_eye (approximate)
+            11: 5,  # left_shoulder
+            12: 6,  # right_shoulder
+            13: 7,  # left_elbow
+            14: 8,  # right_elbow
+            15: 9,  # left_wrist
+            16: 10, # right_wrist
+            23: 11, # left_hip
+            24: 12, # right_hip
+            25: 13, # left_knee
+            26: 14, # right_knee
+            27: 15, # left_ankle
+            28: 16, # right_ankle
+        }
+        self._mp_idx = np.array(list(common_landmarks.keys()))
+        self._tf_idx = np.array(list(common_landmarks.values()))
+        
+        # Reused per-frame MoveNet RGB buffer (only touched on the event loop, or
+        # in a worker under _runtime_lock)
+        self._pre_buf = np.empty((192, 192, 3), dtype=np.uint8)
+        
         # Initialize models only if TensorFlow is available
         if TENSORFLOW_AVAILABLE:
             self._load_models()
@@ -68,10 +143,47 @@ class TensorFlowPoseEstimator:
             logger.warning("TensorFlow not available, skipping model loading")
             return
             
+        # Keep downloaded models in a persistent cache instead of TF Hub's /tmp default
+        cache_dir = os.environ.setdefault("TFHUB_CACHE_DIR", os.path.expanduser("~/.cache/tfhub"))
+        logger.info(f"TF Hub model cache: {cache_dir}")
+        
+        self._configure_gpu_memory()
+        
         try:
+            # Alternative runtimes replace the TF Hub SavedModel entirely
+            if self.movenet_backend == "onnx" or self.movenet_backend in MOVENET_TFLITE_URLS:
+                if self.movenet_backend == "onnx":
+                    self._load_movenet_onnx()
+                else:
+                    self._load_movenet_tflite()
+                self.models_loaded = True
+                logger.info("TensorFlow models loaded successfully")
+                return
+            
             # Load MoveNet Lightning (fast inference)
             logger.info("Loading MoveNet Lightning model...")
-            self.movenet_model = hub.load("https://tfhub.dev/google/movenet/singlepose/lightning/4")
+            self.movenet_model = hub.load(MOVENET_SAVEDMODEL_URL)
+            
+            # Resolve the serving signature once and trace it for a fixed input spec
+            movenet_signature = self.movenet_model.signatures['serving_default']
+            
+            @tf.function(input_signature=[tf.TensorSpec([1, 192, 192, 3], tf.int32)])
+            def _run_movenet(input_image):
+                return movenet_signature(input_image)['output_0']
+            
+            self._movenet_infer = _run_movenet
+            
+            # The exported signature is fixed to batch=1, so batches are mapped
+            # over it inside the graph: one Python->TF dispatch per batch
+            @tf.function(input_signature=[tf.TensorSpec([None, 192, 192, 3], tf.int32)])
+            def _run_movenet_batch(input_images):
+                return tf.map_fn(
+                    lambda image: movenet_signature(image[None])['output_0'][0],
+                    input_images,
+                    fn_output_signature=tf.float32
+                )
+            
+            self._movenet_infer_batch = _run_movenet_batch
             
             # Note: Disabling PoseNet and BodyPix for now to avoid complexity
             # self.posenet_model = hub.load("https://tfhub.dev/google/tfjs-model/posenet/mobilenet/float/075/1/default/1")
@@ -84,18 +196,182 @@ class TensorFlowPoseEstimator:
             logger.error(f"Failed to load TensorFlow models: {e}")
             self.models_loaded = False
     
+    def _configure_gpu_memory(self):
+        """Give TensorFlow a fixed GPU pool sized by AR_CONFIG's gpu_memory_fraction
+        
+        A configured fraction wins over TF_FORCE_GPU_ALLOW_GROWTH: the allocator
+        honours that variable over the memory limit, which would turn the fixed
+        pool into a mere growth cap, so it is cleared before the GPUs initialize.
+        """
+        fraction = AR_CONFIG.get("tensorflow", {}).get("gpu_memory_fraction")
+        if not fraction:
+            return
+        
+        try:
+            gpus = tf.config.list_physical_devices('GPU')
+            if not gpus:
+                return
+            
+            # TF can't report device memory before the GPUs are initialized, so ask
+            # nvidia-smi - restricted to the GPUs TF can see
+            command = ["nvidia-smi", "--query-gpu=memory.total", "--format=csv,noheader,nounits"]
+            visible_devices = os.environ.get("CUDA_VISIBLE_DEVICES")
+            if visible_devices:
+                command[1:1] = ["-i", visible_devices]
+            output = subprocess.check_output(command, text=True, timeout=10)
+            
+            # nvidia-smi lists GPUs in PCI-bus order while TF defaults to fastest
+            # first, so rows can't be paired with devices; size every pool from
+            # the smallest card so no limit exceeds its device
+            memory_limit = int(fraction * min(int(total_mb) for total_mb in output.split()))
+            
+            if os.environ.pop("TF_FORCE_GPU_ALLOW_GROWTH", None) is not None:
+                logger.info("Ignoring TF_FORCE_GPU_ALLOW_GROWTH in favour of gpu_memory_fraction")
+            for gpu in gpus:
+                tf.config.set_logical_device_configuration(
+                    gpu,
+                    [tf.config.LogicalDeviceConfiguration(memory_limit=memory_limit)]
+                )
+            logger.info(f"Limited TensorFlow to {memory_limit} MB of GPU memory on {len(gpus)} device(s)")
+        except Exception as e:
+            logger.warning(f"Could not apply GPU memory fraction {fraction}: {e}")
+    
+    def _load_movenet_tflite(self):
+        """Load a TFLite MoveNet Lightning build into an XNNPACK-backed interpreter"""
+        cache_dir = os.environ["TFHUB_CACHE_DIR"]
+        model_path = os.path.join(cache_dir, f"movenet_lightning_{self.movenet_backend}.tflite")
+        
+        if not os.path.exists(model_path):
+            logger.info(f"Downloading MoveNet Lightning ({self.movenet_backend}) to {model_path}")
+            os.makedirs(cache_dir, exist_ok=True)
+            
+            # Download next to the target and move it into place only once complete,
+            # so an interrupted download never leaves a truncated model to be trusted
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".part")
+            os.close(fd)
+            try:
+                urllib.request.urlretrieve(MOVENET_TFLITE_URLS[self.movenet_backend], tmp_path)
+                os.replace(tmp_path, model_path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+        
+        logger.info(f"Loading MoveNet Lightning ({self.movenet_backend}) TFLite model...")
+        interpreter = tf.lite.Interpreter(model_path=model_path, num_threads=os.cpu_count())
+        interpreter.allocate_tensors()
+        
+        self._tflite_input = interpreter.get_input_details()[0]
+        self._tflite_output = interpreter.get_output_details()[0]
+        self._tflite_interpreter = interpreter
+    
+    def _run_movenet_tflite(self, input_image: np.ndarray) -> np.ndarray:
+        """Run the TFLite interpreter on a [1, 192, 192, 3] RGB batch"""
+        interpreter = self._tflite_interpreter
+        interpreter.set_tensor(
+            self._tflite_input['index'],
+            input_image.astype(self._tflite_input['dtype'], copy=False)
+        )
+        interpreter.invoke()
+        return interpreter.get_tensor(self._tflite_output['index'])
+    
+    def _load_movenet_onnx(self):
+        """Load MoveNet into ONNX Runtime (TensorRT/CUDA when available) with NCHW input"""
+        import onnxruntime as ort
+        
+        cache_dir = os.environ["TFHUB_CACHE_DIR"]
+        onnx_path = os.getenv("MOVENET_ONNX_PATH", os.path.join(cache_dir, "movenet_lightning_nchw.onnx"))
+        if not os.path.exists(onnx_path):
+            self._export_movenet_onnx(onnx_path)
+        
+        available = set(ort.get_available_providers())
+        providers = [
+            provider for provider in ONNX_PROVIDERS
+            if (provider[0] if isinstance(provider, tuple) else provider) in available
+        ]
+        
+        logger.info(f"Loading MoveNet Lightning ONNX model with providers {providers}...")
+        self._onnx_session = ort.InferenceSession(onnx_path, providers=providers)
+        self._onnx_input_name = self._onnx_session.get_inputs()[0].name
+    
+    def _export_movenet_onnx(self, onnx_path: str):
+        """Export the TF Hub MoveNet SavedModel to ONNX with an NCHW input"""
+        import tf2onnx
+        
+        logger.info(f"Exporting MoveNet Lightning to ONNX at {onnx_path}")
+        movenet_signature = hub.load(MOVENET_SAVEDMODEL_URL).signatures['serving_default']
+        input_signature = (tf.TensorSpec([1, 192, 192, 3], tf.int32, name="input"),)
+        
+        @tf.function(input_signature=input_signature)
+        def _movenet(input_image):
+            return movenet_signature(input_image)['output_0']
+        
+        os.makedirs(os.path.dirname(onnx_path) or ".", exist_ok=True)
+        tf2onnx.convert.from_function(
+            _movenet,
+            input_signature=input_signature,
+            opset=13,
+            inputs_as_nchw=["input:0"],
+            output_path=onnx_path
+        )
+    
+    def _run_movenet_onnx(self, input_image: np.ndarray) -> np.ndarray:
+        """Run the ONNX Runtime session on a [1, 192, 192, 3] RGB batch"""
+        nchw = np.ascontiguousarray(input_image.transpose(0, 3, 1, 2), dtype=np.int32)
+        return self._onnx_session.run(None, {self._onnx_input_name: nchw})[0]
+    
+    def _run_movenet_runtime(self, input_image: np.ndarray) -> np.ndarray:
+        """Run the loaded TFLite or ONNX MoveNet runtime on a [1, 192, 192, 3] RGB batch"""
+        if self._onnx_session is not None:
+            return self._run_movenet_onnx(input_image)
+        return self._run_movenet_tflite(input_image)
+    
+    def _movenet_infer_np(self, input_image) -> np.ndarray:
+        """Blocking SavedModel inference, meant to run off the event loop"""
+        return self._movenet_infer(input_image).numpy()
+    
+    def _movenet_runtime_infer_np(self, image: np.ndarray) -> np.ndarray:
+        """Blocking TFLite/ONNX preprocessing and inference, meant to run off the event loop"""
+        with self._runtime_lock:
+            return self._run_movenet_runtime(self._movenet_input_rgb(image, self._pre_buf)[None, ...])
+    
+    def _movenet_runtime_infer_batch_np(self, batch: np.ndarray) -> np.ndarray:
+        """Blocking TFLite/ONNX inference over a batch, one frame at a time"""
+        # The TFLite/ONNX models are built for batch=1
+        with self._runtime_lock:
+            return np.concatenate([
+                self._run_movenet_runtime(batch[i:i + 1]) for i in range(len(batch))
+            ])
+    
+    def warmup(self):
+        """Run one dummy MoveNet inference so graph tracing happens before the first request"""
+        if not self.models_loaded:
+            return
+        
+        try:
+            dummy = np.zeros((192, 192, 3), dtype=np.uint8)
+            if self.movenet_model is None:
+                self._movenet_runtime_infer_np(dummy)
+            else:
+                self._movenet_infer_np(self._preprocess_image_for_movenet(dummy))
+            logger.info("MoveNet warmed up")
+        except Exception as e:
+            logger.warning(f"MoveNet warmup failed: {e}")
+    
     async def estimate_pose_movenet(self, image: np.ndarray) -> PoseEstimation:
         """Estimate pose using MoveNet model"""
-        if not TENSORFLOW_AVAILABLE or not self.models_loaded or self.movenet_model is None:
+        if not TENSORFLOW_AVAILABLE or not self.models_loaded:
             raise RuntimeError("MoveNet model not available - TensorFlow not installed")
         
         try:
-            # Preprocess image
-            input_image = self._preprocess_image_for_movenet(image)
-            
-            # Run inference
-            outputs = self.movenet_model.signatures['serving_default'](input_image)
-            keypoints = outputs['output_0'].numpy()
+            # Inference runs in a worker thread so it doesn't block the event loop
+            if self.movenet_model is None:
+                keypoints = await asyncio.to_thread(self._movenet_runtime_infer_np, image)
+            else:
+                # Preprocess image
+                input_image = self._preprocess_image_for_movenet(image)
+                
+                # Run inference
+                keypoints = await asyncio.to_thread(self._movenet_infer_np, input_image)
             
             # Process results
             pose_estimation = self._process_movenet_output(keypoints[0, 0], image.shape)
@@ -106,6 +382,38 @@ class TensorFlowPoseEstimator:
             logger.error(f"MoveNet pose estimation failed: {e}")
             raise
     
+    async def estimate_pose_movenet_batch(self, images: List[np.ndarray]) -> List[PoseEstimation]:
+        """Estimate poses for several frames with a single MoveNet call"""
+        if not TENSORFLOW_AVAILABLE or not self.models_loaded:
+            raise RuntimeError("MoveNet model not available - TensorFlow not installed")
+        
+        if not images:
+            return []
+        
+        try:
+            # Preprocess all frames straight into one [N, 192, 192, 3] batch
+            batch = np.empty((len(images), 192, 192, 3), dtype=np.uint8)
+            for i, image in enumerate(images):
+                self._movenet_input_rgb(image, batch[i])
+            
+            # Run inference, output is [N, 1, 17, 3]
+            if self.movenet_model is None:
+                keypoints = await asyncio.to_thread(self._movenet_runtime_infer_batch_np, batch)
+            else:
+                input_images = tf.constant(batch, dtype=tf.int32)
+                keypoints = await asyncio.to_thread(
+                    lambda: self._movenet_infer_batch(input_images).numpy()
+                )
+            
+            return [
+                self._process_movenet_output(keypoints[i, 0], image.shape)
+                for i, image in enumerate(images)
+            ]
+            
+        except Exception as e:
+            logger.error(f"MoveNet batch pose estimation failed: {e}")
+            raise
+    
     async def estimate_pose_posenet(self, image: np.ndarray) -> PoseEstimation:
         """Estimate pose using PoseNet model (disabled for now)"""
         raise RuntimeError("PoseNet model not available in this version")
@@ -113,26 +421,28 @@ class TensorFlowPoseEstimator:
     async def segment_person(self, image: np.ndarray) -> np.ndarray:
         """Segment person from background using fallback method"""
         logger.info("Using fallback person segmentation (no TensorFlow)")
-        return self._fallback_person_segmentation(image)
+        return await asyncio.to_thread(self._fallback_person_segmentation, image)
+    
+    def _movenet_input_rgb(self, image: np.ndarray, dst: Optional[np.ndarray] = None) -> np.ndarray:
+        """Resize a BGR frame to MoveNet's 192x192 uint8 RGB input (into ``dst`` if given)"""
+        # Resize to 192x192 for Lightning model
+        resized = cv2.resize(image, (192, 192), dst=dst, interpolation=cv2.INTER_LINEAR)
+        
+        # Convert BGR to RGB in place on the small buffer
+        return cv2.cvtColor(resized, cv2.COLOR_BGR2RGB, dst=resized)
     
     def _preprocess_image_for_movenet(self, image: np.ndarray):
         """Preprocess image for MoveNet model"""
         if not TENSORFLOW_AVAILABLE:
             raise RuntimeError("TensorFlow not available")
-            
-        # Resize to 192x192 for Lightning model
-        resized = cv2.resize(image, (192, 192))
-        
-        # Convert BGR to RGB
-        rgb_image = cv2.cvtColor(resized, cv2.COLOR_BGR2RGB)
-        
-        # Normalize to [0, 1]
-        normalized = rgb_image.astype(np.float32) / 255.0
         
-        # Add batch dimension
-        input_tensor = tf.expand_dims(normalized, axis=0)
+        rgb_image = self._movenet_input_rgb(image, self._pre_buf)
         
-        return tf.cast(input_tensor, dtype=tf.int32)
+        # MoveNet v4 takes int32 pixels in [0, 255] with a batch dimension. The
+        # int32 batch is a fresh array per call: tf.constant may alias it rather
+        # than copy, and inference runs in a worker thread while the next frame
+        # is being preprocessed
+        return tf.constant(rgb_image[None, ...].astype(np.int32))
     
     def _preprocess_image_for_posenet(self, image: np.ndarray):
         """Preprocess image for PoseNet model (disabled)"""
@@ -146,46 +456,15 @@ class TensorFlowPoseEstimator:
         """Process MoveNet model output"""
         h, w, _ = image_shape
         
-        # Convert keypoints to PoseKeypoint objects
-        pose_keypoints = []
-        total_confidence = 0
-        
-        for i, kp in enumerate(keypoints):
-            y, x, confidence = kp
-            
-            # Convert normalized coordinates to pixel coordinates
-            pixel_x = int(x * w)
-            pixel_y = int(y * h)
-            
-            pose_keypoints.append(PoseKeypoint(pixel_x, pixel_y, confidence))
-            total_confidence += confidence
-        
-        # Calculate overall confidence
-        overall_confidence = total_confidence / len(keypoints)
-        
-        # Calculate bounding box
-        valid_points = [kp for kp in pose_keypoints if kp.confidence > 0.3]
-        if valid_points:
-            min_x = min(kp.x for kp in valid_points)
-            max_x = max(kp.x for kp in valid_points)
-            min_y = min(kp.y for kp in valid_points)
-            max_y = max(kp.y for kp in valid_points)
-            
-            # Add padding
-            padding = 20
-            bounding_box = (
-                max(0, min_x - padding),
-                max(0, min_y - padding),
-                min(w, max_x - min_x + 2 * padding),
-                min(h, max_y - min_y + 2 * padding)
-            )
-        else:
-            bounding_box = (0, 0, w, h)
+        # MoveNet rows are (y, x, confidence) normalized; convert to pixel (x, y)
+        keypoints_xy = (keypoints[:, [1, 0]] * np.array([w, h], np.float32)).astype(np.int32)
+        confidences = keypoints[:, 2].astype(np.float32)
         
         return PoseEstimation(
-            keypoints=pose_keypoints,
-            overall_confidence=overall_confidence,
-            bounding_box=bounding_box
+            keypoints_xy=keypoints_xy,
+            keypoints_conf=confidences,
+            overall_confidence=float(confidences.mean()),
+            bounding_box=self._keypoints_bounding_box(keypoints_xy, confidences, w, h)
         )
     
     def _process_posenet_output(self, outputs: Dict[str, Any], image_shape: Tuple[int, int, int]) -> PoseEstimation:
@@ -196,45 +475,32 @@ class TensorFlowPoseEstimator:
         keypoints = outputs['keypoints'].numpy()[0]
         keypoint_scores = outputs['keypoint_scores'].numpy()[0]
         
-        # Convert to PoseKeypoint objects
-        pose_keypoints = []
-        total_confidence = 0
-        
-        for i, (kp, score) in enumerate(zip(keypoints, keypoint_scores)):
-            y, x = kp
-            
-            # Convert coordinates to pixel space
-            pixel_x = int(x * w / 257)  # PoseNet uses 257x257 input
-            pixel_y = int(y * h / 257)
-            
-            pose_keypoints.append(PoseKeypoint(pixel_x, pixel_y, score))
-            total_confidence += score
-        
-        # Calculate overall confidence
-        overall_confidence = total_confidence / len(keypoints)
-        
-        # Calculate bounding box (similar to MoveNet)
-        valid_points = [kp for kp in pose_keypoints if kp.confidence > 0.3]
-        if valid_points:
-            min_x = min(kp.x for kp in valid_points)
-            max_x = max(kp.x for kp in valid_points)
-            min_y = min(kp.y for kp in valid_points)
-            max_y = max(kp.y for kp in valid_points)
-            
-            padding = 20
-            bounding_box = (
-                max(0, min_x - padding),
-                max(0, min_y - padding),
-                min(w, max_x - min_x + 2 * padding),
-                min(h, max_y - min_y + 2 * padding)
-            )
-        else:
-            bounding_box = (0, 0, w, h)
+        # Convert (y, x) to pixel (x, y) - PoseNet uses 257x257 input
+        keypoints_xy = (keypoints[:, [1, 0]] * np.array([w, h]) / 257).astype(np.int32)
+        confidences = keypoint_scores.astype(np.float32)
         
         return PoseEstimation(
-            keypoints=pose_keypoints,
-            overall_confidence=overall_confidence,
-            bounding_box=bounding_box
+            keypoints_xy=keypoints_xy,
+            keypoints_conf=confidences,
+            overall_confidence=float(confidences.mean()),
+            bounding_box=self._keypoints_bounding_box(keypoints_xy, confidences, w, h)
+        )
+    
+    def _keypoints_bounding_box(self, keypoints_xy: np.ndarray, confidences: np.ndarray, w: int, h: int) -> Tuple[int, int, int, int]:
+        """Padded bounding box around keypoints with confidence above 0.3"""
+        valid = confidences > 0.3
+        if not valid.any():
+            return (0, 0, w, h)
+        
+        min_x, min_y = keypoints_xy[valid].min(axis=0).tolist()
+        max_x, max_y = keypoints_xy[valid].max(axis=0).tolist()
+        
+        padding = 20
+        return (
+            max(0, min_x - padding),
+            max(0, min_y - padding),
+            min(w, max_x - min_x + 2 * padding),
+            min(h, max_y - min_y + 2 * padding)
         )
     
     def _process_segmentation_mask(self, segmentation: np.ndarray, image_shape: Tuple[int, int, int]) -> np.ndarray:
@@ -251,19 +517,24 @@ class TensorFlowPoseEstimator:
     
     def _fallback_person_segmentation(self, image: np.ndarray) -> np.ndarray:
         """Fallback person segmentation using traditional CV methods"""
-        # Simple background subtraction or edge-based segmentation
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        h, w = image.shape[:2]
         
-        # Use adaptive thresholding
-        binary = cv2.adaptiveThreshold(
-            gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
-        )
+        # Work on a copy at most 256px on the long side - a rough mask doesn't need full resolution
+        scale = min(1.0, 256 / max(h, w))
+        small = cv2.resize(image, (max(1, int(w * scale)), max(1, int(h * scale)))) if scale < 1.0 else image
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        
+        # Single-pass global Otsu threshold
+        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
         
         # Morphological operations to clean up
-        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
+        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
         binary = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel)
         binary = cv2.morphologyEx(binary, cv2.MORPH_OPEN, kernel)
         
+        if binary.shape[:2] != (h, w):
+            binary = cv2.resize(binary, (w, h), interpolation=cv2.INTER_NEAREST)
+        
         return binary
     
     async def enhance_pose_with_tensorflow(self, mediapipe_pose, image: np.ndarray) -> Dict[str, Any]:
@@ -309,68 +580,58 @@ class TensorFlowPoseEstimator:
     def _combine_pose_estimates(self, mp_pose, tf_pose: PoseEstimation, image_shape: Tuple[int, int, int]) -> List[Dict[str, Any]]:
         """Combine MediaPipe and TensorFlow pose estimates for better accuracy"""
         h, w, _ = image_shape
-        enhanced_landmarks = []
         
-        # MediaPipe has 33 landmarks, TensorFlow (MoveNet) has 17
-        # Map common landmarks and use confidence-weighted averaging
+        mp_landmarks = mp_pose.pose_landmarks.landmark if mp_pose.pose_landmarks else []
         
-        common_landmarks = {
-            0: 0,   # nose
-            5: 1,   # left_shoulder -> left_eye (approximate)
-            6: 2,   # right_shoulder -> right_eye (approximate)
-            11: 5,  # left_shoulder
-            12: 6,  # right_shoulder
-            13: 7,  # left_elbow
-            14: 8,  # right_elbow
-            15: 9,  # left_wrist
-            16: 10, # right_wrist
-            23: 11, # left_hip
-            24: 12, # right_hip
-            25: 13, # left_knee
-            26: 14, # right_knee
-            27: 15, # left_ankle
-            28: 16, # right_ankle
-        }
+        available = (self._mp_idx < len(mp_landmarks)) & (self._tf_idx < len(tf_pose.keypoints_conf))
+        mp_idx, tf_idx = self._mp_idx[available], self._tf_idx[available]
         
-        mp_landmarks = mp_pose.pose_landmarks.landmark if mp_pose.pose_landmarks else []
+        # MediaPipe normalized coordinates -> pixels, plus visibility as confidence
+        mp_points = np.array(
+            [(lm.x, lm.y, lm.visibility) for lm in mp_landmarks], dtype=np.float64
+        ).reshape(-1, 3)[mp_idx]
+        mp_xy = (mp_points[:, :2] * (w, h)).astype(np.int64)
+        mp_conf = mp_points[:, 2]
         
-        for mp_idx, tf_idx in common_landmarks.items():
-            if mp_idx < len(mp_landmarks) and tf_idx < len(tf_pose.keypoints):
-                mp_lm = mp_landmarks[mp_idx]
-                tf_kp = tf_pose.keypoints[tf_idx]
-                
-                # Convert MediaPipe normalized coordinates to pixels
-                mp_x = int(mp_lm.x * w)
-                mp_y = int(mp_lm.y * h)
-                mp_conf = mp_lm.visibility
-                
-                # TensorFlow coordinates are already in pixels
-                tf_x = tf_kp.x
-                tf_y = tf_kp.y
-                tf_conf = tf_kp.confidence
-                
-                # Weighted average based on confidence
-                total_conf = mp_conf + tf_conf
-                if total_conf > 0:
-                    enhanced_x = (mp_x * mp_conf + tf_x * tf_conf) / total_conf
-                    enhanced_y = (mp_y * mp_conf + tf_y * tf_conf) / total_conf
-                    enhanced_conf = max(mp_conf, tf_conf)  # Use higher confidence
-                else:
-                    enhanced_x = (mp_x + tf_x) / 2
-                    enhanced_y = (mp_y + tf_y) / 2
-                    enhanced_conf = 0.0
-                
-                enhanced_landmarks.append({
-                    'landmark_id': mp_idx,
-                    'x': enhanced_x,
-                    'y': enhanced_y,
-                    'confidence': enhanced_conf,
-                    'mediapipe_conf': mp_conf,
-                    'tensorflow_conf': tf_conf
-                })
+        # TensorFlow coordinates are already in pixels
+        tf_xy = tf_pose.keypoints_xy[tf_idx]
+        tf_conf = tf_pose.keypoints_conf[tf_idx].astype(np.float64)
+        
+        # Weighted average based on confidence, plain average when both are zero
+        total_conf = mp_conf + tf_conf
+        weighted = total_conf > 0
+        enhanced_xy = np.where(
+            weighted[:, None],
+            (mp_xy * mp_conf[:, None] + tf_xy * tf_conf[:, None]) / np.where(weighted, total_conf, 1.0)[:, None],
+            (mp_xy + tf_xy) / 2
+        )
+        enhanced_conf = np.where(weighted, np.maximum(mp_conf, tf_conf), 0.0)  # Use higher confidence
+        
+        enhanced_landmarks = [
+            {
+                'landmark_id': landmark_id,
+                'x': x,
+                'y': y,
+                'confidence': confidence,
+                'mediapipe_conf': mp_c,
+                'tensorflow_conf': tf_c
+            }
+            for landmark_id, (x, y), confidence, mp_c, tf_c in zip(
+                mp_idx.tolist(), enhanced_xy.tolist(), enhanced_conf.tolist(),
+                mp_conf.tolist(), tf_conf.tolist()
+            )
+        ]
         
         return enhanced_landmarks
 
 
-# Singleton instance
-tf_pose_estimator = TensorFlowPoseEstimator()
+# Shared instance, created on first use so importing this module never loads models
+_pose_estimator: Optional[TensorFlowPoseEstimator] = None
+
+
+def get_pose_estimator() -> TensorFlowPoseEstimator:
+    """Get the shared pose estimator, loading its models on first call"""
+    global _pose_estimator
+    if _pose_estimator is None:
+        _pose_estimator = TensorFlowPoseEstimator()
+    return _pose_estimator
@@ -1,5 +1,8 @@
+import asyncio
 from typing import Optional, List
 from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 from datetime import datetime
 from app.core.database import get_database
 from app.core.security import get_password_hash, verify_password
@@ -8,20 +11,32 @@ from app.models.user import UserCreate, UserUpdate, UserInDB, User
 class UserService:
     def __init__(self):
         self.collection_name = "users"
+        self._collection = None
+        # Listings only need the public ``User`` fields, never the password hash
+        self._list_projection = {
+            field.alias or name: 1 for name, field in User.model_fields.items()
+        }
     
     async def get_collection(self):
-        """Get users collection"""
-        db = await get_database()
-        return db[self.collection_name]
+        """Get users collection (looked up once, then reused)"""
+        if self._collection is None:
+            db = await get_database()
+            self._collection = db[self.collection_name]
+        return self._collection
     
-    async def create_user(self, user_data: UserCreate) -> UserInDB:
-        """Create a new user"""
+    async def ensure_indexes(self):
+        """Create the indexes backing login lookups and recent-user listings"""
         collection = await self.get_collection()
+        await collection.create_index("email", unique=True)
+        await collection.create_index([("created_at", -1)])
+    
+    async def create_user(self, user_data: UserCreate, role: str = "user") -> UserInDB:
+        """Create a new user
         
-        # Check if user already exists
-        existing_user = await collection.find_one({"email": user_data.email})
-        if existing_user:
-            raise ValueError("User with this email already exists")
+        The role is set by the caller rather than taken from ``user_data``, so
+        public sign-ups can never choose their own role.
+        """
+        collection = await self.get_collection()
         
         # Hash the password
         hashed_password = get_password_hash(user_data.password)
@@ -33,15 +48,73 @@ class UserService:
             last_name=user_data.last_name,
             phone=user_data.phone,
             hashed_password=hashed_password,
-            is_active=user_data.is_active
+            is_active=user_data.is_active,
+            role=role
         )
         
-        # Insert into database
-        result = await collection.insert_one(user_doc.dict(by_alias=True))
+        # Insert into database - the unique email index rejects duplicates
+        try:
+            result = await collection.insert_one(user_doc.dict(by_alias=True))
+        except DuplicateKeyError:
+            raise ValueError("User with this email already exists")
         user_doc.id = result.inserted_id
         
         return user_doc
     
+    async def bulk_create_users(self, users: List[UserCreate]) -> List[UserInDB]:
+        """Create several users with a single insert (for trusted seed scripts)
+        
+        Unlike ``create_user`` the role is taken from each ``UserCreate``.
+        """
+        collection = await self.get_collection()
+        
+        # bcrypt dominates the cost here; hash every password concurrently off the event loop
+        hashed_passwords = await asyncio.gather(*(
+            asyncio.to_thread(get_password_hash, user_data.password)
+            for user_data in users
+        ))
+        
+        user_docs = [
+            UserInDB(
+                email=user_data.email,
+                first_name=user_data.first_name,
+                last_name=user_data.last_name,
+                phone=user_data.phone,
+                hashed_password=hashed_password,
+                is_active=user_data.is_active,
+                role=user_data.role
+            )
+            for user_data, hashed_password in zip(users, hashed_passwords)
+        ]
+        
+        if user_docs:
+            await collection.insert_many(
+                [user_doc.dict(by_alias=True) for user_doc in user_docs],
+                ordered=False
+            )
+        
+        return user_docs
+    
+    async def upsert_admin(self, email: str, hashed_password: str, first_name: str, last_name: str) -> bool:
+        """Create the admin account unless a user with this email exists; returns True if created"""
+        collection = await self.get_collection()
+        
+        admin_doc = UserInDB(
+            email=email,
+            first_name=first_name,
+            last_name=last_name,
+            hashed_password=hashed_password,
+            role="admin"
+        ).dict(by_alias=True)
+        
+        # One idempotent write instead of a lookup followed by an insert
+        result = await collection.update_one(
+            {"email": email},
+            {"$setOnInsert": admin_doc},
+            upsert=True
+        )
+        return result.upserted_id is not None
+    
     async def get_user_by_email(self, email: str) -> Optional[UserInDB]:
         """Get user by email"""
         collection = await self.get_collection()
@@ -69,13 +142,14 @@ class UserService:
         if update_data:
             update_data["updated_at"] = datetime.utcnow()
             
-            result = await collection.update_one(
+            user_doc = await collection.find_one_and_update(
                 {"_id": ObjectId(user_id)},
-                {"$set": update_data}
+                {"$set": update_data},
+                return_document=ReturnDocument.AFTER
             )
             
-            if result.modified_count:
-                return await self.get_user_by_id(user_id)
+            if user_doc:
+                return User(**user_doc)
         
         return None
     
@@ -88,7 +162,7 @@ class UserService:
     async def get_all_users(self, skip: int = 0, limit: int = 100) -> List[User]:
         """Get all users with pagination"""
         collection = await self.get_collection()
-        cursor = collection.find().skip(skip).limit(limit)
+        cursor = collection.find({}, self._list_projection).skip(skip).limit(limit)
         users = await cursor.to_list(length=limit)
         
         return [User(**user) for user in users]
@@ -120,11 +194,11 @@ class UserService:
         )
         return result.modified_count > 0
 
-    async def get_recent_users(self, limit: int = 10) -> List[UserInDB]:
+    async def get_recent_users(self, limit: int = 10) -> List[User]:
         """Get recently created users"""
         collection = await self.get_collection()
         
-        cursor = collection.find({}).sort("created_at", -1).limit(limit)
+        cursor = collection.find({}, self._list_projection).sort("created_at", -1).limit(limit)
         users = await cursor.to_list(length=limit)
         
-        return [UserInDB(**user) for user in users]
+        return [User(**user) for user in users]
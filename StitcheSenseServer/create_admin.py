@@ -32,15 +32,8 @@ async def create_admin_user():
     )
     
     try:
-        # Create the user
-        user = await user_service.create_user(admin_data)
-        
-        # Update the user role to admin
-        collection = await user_service.get_collection()
-        await collection.update_one(
-            {"email": admin_email},
-            {"$set": {"role": "admin"}}
-        )
+        # Create the user with the admin role in a single insert
+        user = await user_service.create_user(admin_data, role="admin")
         
         print(f"✅ Admin user created successfully!")
         print(f"Email: {admin_email}")
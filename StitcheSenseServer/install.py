@@ -16,22 +16,17 @@ def run_command(command, description):
     print(f"{'='*50}")
     
     try:
+        # Output streams straight to the terminal so long installs show progress
         if isinstance(command, str):
-            result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
+            subprocess.run(command, shell=True, check=True)
         else:
-            result = subprocess.run(command, check=True, capture_output=True, text=True)
+            subprocess.run(command, check=True)
         
-        if result.stdout:
-            print(result.stdout)
         print(f"✅ {description} completed successfully!")
         return True
     except subprocess.CalledProcessError as e:
         print(f"❌ Error during {description}:")
         print(f"Exit code: {e.returncode}")
-        if e.stdout:
-            print(f"Output: {e.stdout}")
-        if e.stderr:
-            print(f"Error: {e.stderr}")
         return False
     except Exception as e:
         print(f"❌ Unexpected error during {description}: {str(e)}")
@@ -65,10 +60,11 @@ def install_dependencies():
     ]
     
     print("📦 Installing Python dependencies...")
-    for requirement in requirements:
-        if not run_command(f"pip install {requirement}", f"Installing {requirement}"):
-            return False
-    return True
+    # One pip run resolves all pins together instead of once per package
+    return run_command(
+        [sys.executable, "-m", "pip", "install", *requirements],
+        f"Installing {len(requirements)} packages"
+    )
 
 def create_env_file():
     """Create .env file with default configuration"""
@@ -87,11 +83,18 @@ SECRET_KEY=your-secret-key-here-change-in-production
 ALGORITHM=HS256
 ACCESS_TOKEN_EXPIRE_MINUTES=30
 
+# Password hashing cost (12 by default). Lowering it (minimum 4) speeds up
+# dev/CI bootstraps such as create_admin.py - never lower it in production.
+BCRYPT_ROUNDS=12
+
 # Server Configuration
 HOST=0.0.0.0
 PORT=8000
 DEBUG=True
 
+# OpenCV worker threads per server process (pose/AR image ops)
+OPENCV_THREADS=1
+
 # CORS
 CORS_ORIGINS=["http://localhost:5173", "http://127.0.0.1:5173"]
 
@@ -119,15 +122,15 @@ def create_directories():
         "tests"
     ]
     
-    for directory in directories:
-        dir_path = Path(directory)
-        if not dir_path.exists():
-            try:
-                dir_path.mkdir(parents=True, exist_ok=True)
-                print(f"📁 Created directory: {directory}")
-            except Exception as e:
-                print(f"❌ Error creating directory {directory}: {str(e)}")
-                return False
+    # mkdir(exist_ok=True) already tolerates existing directories, so no stat first
+    directory = None
+    try:
+        for directory in directories:
+            Path(directory).mkdir(parents=True, exist_ok=True)
+    except Exception as e:
+        print(f"❌ Error creating directory {directory}: {str(e)}")
+        return False
+    print(f"📁 Directories ready: {', '.join(directories)}")
     return True
 
 def main():
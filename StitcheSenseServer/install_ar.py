@@ -3,12 +3,22 @@ Enhanced installation script for StitcheSense AR features
 Installs TensorFlow and sets up AR augmentation capabilities
 """
 
+import shutil
 import subprocess
 import sys
 import os
+import textwrap
+import json
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+# Quiet TensorFlow's startup banners and let GPU memory grow on demand; the
+# verification subprocesses inherit these before their first TF import
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+os.environ.setdefault("TF_ENABLE_ONEDNN_OPTS", "0")
+os.environ.setdefault("TF_FORCE_GPU_ALLOW_GROWTH", "true")
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -29,11 +39,15 @@ def install_requirements():
     logger.info("Installing requirements...")
     
     try:
-        # Upgrade pip first
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "--upgrade", "pip"])
+        # Resolve and download with uv (much faster than pip); bootstrap it once
+        if shutil.which("uv"):
+            uv = ["uv"]
+        else:
+            subprocess.check_call([sys.executable, "-m", "pip", "install", "uv"])
+            uv = [sys.executable, "-m", "uv"]
         
-        # Install requirements
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
+        # Install requirements into this interpreter's environment
+        subprocess.check_call([*uv, "pip", "install", "--python", sys.executable, "-r", "requirements.txt"])
         
         logger.info("Requirements installed successfully")
         return True
@@ -43,114 +57,118 @@ def install_requirements():
         return False
 
 
+def run_verification_script(script):
+    """Run a verification snippet in a fresh interpreter, returning (success, output lines, error)"""
+    try:
+        result = subprocess.run(
+            [sys.executable, "-c", textwrap.dedent(script)],
+            capture_output=True,
+            text=True,
+            timeout=60
+        )
+    except subprocess.TimeoutExpired:
+        return False, [], "timed out after 60 seconds"
+    
+    output = result.stdout.splitlines()
+    stderr = result.stderr.strip().splitlines()
+    error = stderr[-1] if stderr else f"exit code {result.returncode}"
+    return result.returncode == 0, output, error
+
+
 def check_gpu_availability():
     """Check if GPU is available for TensorFlow"""
-    try:
+    success, output, error = run_verification_script("""
         import tensorflow as tf
         
         gpus = tf.config.list_physical_devices('GPU')
         if gpus:
-            logger.info(f"GPU detected: {len(gpus)} device(s)")
+            print(f"GPU detected: {len(gpus)} device(s)")
             for i, gpu in enumerate(gpus):
-                logger.info(f"  GPU {i}: {gpu}")
-            
-            # Enable memory growth to avoid allocating all GPU memory
-            for gpu in gpus:
-                tf.config.experimental.set_memory_growth(gpu, True)
-            
-            return True
+                print(f"  GPU {i}: {gpu}")
         else:
-            logger.info("No GPU detected, using CPU for TensorFlow operations")
-            return False
-            
-    except ImportError:
-        logger.warning("TensorFlow not installed, skipping GPU check")
-        return False
-    except Exception as e:
-        logger.warning(f"Error checking GPU availability: {e}")
+            print("No GPU detected, using CPU for TensorFlow operations")
+    """)
+    
+    for line in output:
+        logger.info(line)
+    if not success:
+        if "ModuleNotFoundError" in error or "ImportError" in error:
+            logger.warning("TensorFlow not installed, skipping GPU check")
+        else:
+            logger.warning(f"Error checking GPU availability: {error}")
         return False
+    return any(line.startswith("GPU detected") for line in output)
 
 
 def verify_tensorflow_installation():
     """Verify TensorFlow installation and basic functionality"""
-    try:
+    success, output, error = run_verification_script("""
         import tensorflow as tf
         import tensorflow_hub as hub
         
-        logger.info(f"TensorFlow version: {tf.__version__}")
-        logger.info(f"TensorFlow Hub version: {hub.__version__}")
+        print(f"TensorFlow version: {tf.__version__}")
+        print(f"TensorFlow Hub version: {hub.__version__}")
         
-        # Test basic TensorFlow operations
-        x = tf.constant([[1.0, 2.0], [3.0, 4.0]])
-        y = tf.constant([[1.0, 1.0], [0.0, 1.0]])
-        result = tf.matmul(x, y)
-        
-        logger.info("TensorFlow basic operations test: PASSED")
-        
-        # Check if CUDA is available (for GPU support)
+        # Check if CUDA is available (for GPU support) - device listing only,
+        # without creating a CUDA context
         if tf.test.is_built_with_cuda():
-            logger.info("TensorFlow built with CUDA support")
-            if tf.test.is_gpu_available():
-                logger.info("GPU is available for TensorFlow")
+            print("TensorFlow built with CUDA support")
+            if tf.config.list_physical_devices('GPU'):
+                print("GPU is available for TensorFlow")
             else:
-                logger.info("GPU not available, but CUDA support is built-in")
+                print("GPU not available, but CUDA support is built-in")
         else:
-            logger.info("TensorFlow built without CUDA support (CPU only)")
-        
-        return True
-        
-    except ImportError as e:
-        logger.error(f"TensorFlow import failed: {e}")
-        return False
-    except Exception as e:
-        logger.error(f"TensorFlow verification failed: {e}")
-        return False
+            print("TensorFlow built without CUDA support (CPU only)")
+    """)
+    
+    for line in output:
+        logger.info(line)
+    if not success:
+        logger.error(f"TensorFlow verification failed: {error}")
+    return success
 
 
 def verify_opencv_installation():
     """Verify OpenCV installation"""
-    try:
+    success, output, error = run_verification_script("""
+        import os
         import cv2
-        logger.info(f"OpenCV version: {cv2.__version__}")
+        print(f"OpenCV version: {cv2.__version__}")
         
         # Test basic OpenCV operations
         img = cv2.imread("static/test_image.jpg") if os.path.exists("static/test_image.jpg") else None
         if img is not None:
             gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-            logger.info("OpenCV basic operations test: PASSED")
+            print("OpenCV basic operations test: PASSED")
         else:
-            logger.info("OpenCV import successful (no test image available)")
-        
-        return True
-        
-    except ImportError as e:
-        logger.error(f"OpenCV import failed: {e}")
-        return False
-    except Exception as e:
-        logger.error(f"OpenCV verification failed: {e}")
-        return False
+            print("OpenCV import successful (no test image available)")
+    """)
+    
+    for line in output:
+        logger.info(line)
+    if not success:
+        logger.error(f"OpenCV verification failed: {error}")
+    return success
 
 
 def verify_mediapipe_installation():
     """Verify MediaPipe installation"""
-    try:
+    success, output, error = run_verification_script("""
         import mediapipe as mp
-        logger.info(f"MediaPipe version: {mp.__version__}")
+        print(f"MediaPipe version: {mp.__version__}")
         
         # Test MediaPipe pose initialization
         mp_pose = mp.solutions.pose
         pose = mp_pose.Pose()
-        logger.info("MediaPipe pose initialization: PASSED")
+        print("MediaPipe pose initialization: PASSED")
         pose.close()
-        
-        return True
-        
-    except ImportError as e:
-        logger.error(f"MediaPipe import failed: {e}")
-        return False
-    except Exception as e:
-        logger.error(f"MediaPipe verification failed: {e}")
-        return False
+    """)
+    
+    for line in output:
+        logger.info(line)
+    if not success:
+        logger.error(f"MediaPipe verification failed: {error}")
+    return success
 
 
 def setup_directories():
@@ -163,26 +181,27 @@ def setup_directories():
         "uploads/ar_frames"
     ]
     
-    for directory in directories:
-        Path(directory).mkdir(parents=True, exist_ok=True)
-        logger.info(f"Created directory: {directory}")
+    missing = [Path(directory) for directory in directories if not Path(directory).exists()]
+    for path in missing:
+        path.mkdir(parents=True, exist_ok=True)
+    
+    if missing:
+        logger.info(f"Created directories: {', '.join(str(path) for path in missing)}")
 
 
-def create_ar_config():
-    """Create AR configuration file"""
-    ar_config = """
 # AR Augmentation Configuration
 AR_CONFIG = {
     "tensorflow": {
         "model_cache_dir": "models/tensorflow",
         "movenet_model_url": "https://tfhub.dev/google/movenet/singlepose/lightning/4",
         "posenet_model_url": "https://tfhub.dev/google/tfjs-model/posenet/mobilenet/float/075/1/default/1",
-        "bodypix_model_url": "https://tfhub.dev/tensorflow/tfjs-model/bodypix/mobilenet/float/075/1/default/1"
+        "bodypix_model_url": "https://tfhub.dev/tensorflow/tfjs-model/bodypix/mobilenet/float/075/1/default/1",
+        "gpu_memory_fraction": 0.6  # fixed GPU pool instead of on-demand growth
     },
     "mediapipe": {
         "pose_confidence": 0.5,
         "tracking_confidence": 0.5,
-        "model_complexity": 2
+        "model_complexity": 1
     },
     "processing": {
         "max_frame_size": 1920,
@@ -196,11 +215,13 @@ AR_CONFIG = {
         "default_opacity": 0.7
     }
 }
-"""
-    
-    config_path = "app/core/ar_config.py"
-    with open(config_path, "w") as f:
-        f.write(ar_config)
+
+
+def create_ar_config():
+    """Create AR configuration file"""
+    # Plain data rather than Python source: the server just parses it
+    config_path = Path("app/core/ar_config.json")
+    config_path.write_text(json.dumps(AR_CONFIG, indent=4))
     
     logger.info(f"Created AR configuration file: {config_path}")
 
@@ -209,7 +230,9 @@ def test_ar_service():
     """Test AR augmentation service initialization"""
     try:
         from app.services.ar_augmentation_service import ar_service
-        from app.services.tensorflow_pose_service import tf_pose_estimator
+        from app.services.tensorflow_pose_service import get_pose_estimator
+        
+        get_pose_estimator()
         
         logger.info("AR augmentation service imported successfully")
         
@@ -293,10 +316,19 @@ def main():
     
     # Verify installations
     if success_flags['requirements']:
-        success_flags['tensorflow'] = verify_tensorflow_installation()
-        success_flags['opencv'] = verify_opencv_installation()
-        success_flags['mediapipe'] = verify_mediapipe_installation()
-        success_flags['gpu'] = check_gpu_availability()
+        checks = {
+            'tensorflow': verify_tensorflow_installation,
+            'opencv': verify_opencv_installation,
+            'mediapipe': verify_mediapipe_installation,
+            'gpu': check_gpu_availability
+        }
+        
+        # Every check runs in its own interpreter, so threads are enough to
+        # overlap the framework imports
+        with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+            futures = {executor.submit(check): name for name, check in checks.items()}
+            for future in as_completed(futures):
+                success_flags[futures[future]] = future.result()
     
     # Set up directories and configuration
     setup_directories()
@@ -1,3 +1,5 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -5,6 +7,31 @@ from pathlib import Path
 from app.core.config import settings
 from app.core.database import connect_to_mongo, close_mongo_connection
 from app.api import auth, products, admin, measurements, ar_augmentation
+from app.services.product_service import ProductService
+from app.services.user_service import UserService
+
+def preload_pose_model():
+    """Load and warm up the MoveNet pose model (no-op without TensorFlow)"""
+    from app.services.tensorflow_pose_service import get_pose_estimator
+    get_pose_estimator().warmup()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Connect to MongoDB and build indexes on startup, disconnect on shutdown"""
+    # Create static directories if they don't exist
+    Path("static", "images", "products").mkdir(parents=True, exist_ok=True)
+    
+    await connect_to_mongo()
+    startup_tasks = [
+        UserService().ensure_indexes(),
+        ProductService().ensure_indexes()
+    ]
+    if settings.PRELOAD_POSE_MODEL:
+        # Importing TF and loading MoveNet blocks, so keep it off the event loop
+        startup_tasks.append(asyncio.to_thread(preload_pose_model))
+    await asyncio.gather(*startup_tasks)
+    yield
+    await close_mongo_connection()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -12,41 +39,57 @@ app = FastAPI(
     version="1.0.0",
     openapi_url="/api/openapi.json",
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    lifespan=lifespan
 )
 
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["http://localhost:3000", "http://localhost:5173"],  # Frontend URLs
+    allow_origins=("http://localhost:3000", "http://localhost:5173"),  # Frontend URLs
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Product list pagination cursor
 )
 
-# Event handlers
-@app.on_event("startup")
-async def startup_db_client():
-    await connect_to_mongo()
+class CachedStaticFiles(StaticFiles):
+    """Static files served with a fixed Cache-Control header"""
+    
+    def __init__(self, *args, cache_control: str, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_control = cache_control
+    
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = self.cache_control
+        return response
 
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    await close_mongo_connection()
-
-# Create static directories if they don't exist
-static_dir = Path("static")
-static_dir.mkdir(exist_ok=True)
-(static_dir / "images" / "products").mkdir(parents=True, exist_ok=True)
-
-# Mount static files
-app.mount("/api/static", StaticFiles(directory="static"), name="static")
+# Mount static files (no directory index pages, no directory check per mount).
+# Product image files keep their upload names and can be replaced or deleted,
+# so browsers may cache them for a day rather than forever; the dedicated mount
+# must come before the general one to match first
+app.mount(
+    "/api/static/images/products",
+    CachedStaticFiles(
+        directory="static/images/products",
+        html=False,
+        check_dir=False,
+        cache_control="public, max-age=86400"
+    ),
+    name="product_images"
+)
+app.mount("/api/static", StaticFiles(directory="static", html=False, check_dir=False), name="static")
 
 # Include routers
-app.include_router(auth.router, prefix="/api/auth", tags=["authentication"])
-app.include_router(products.router, prefix="/api/products", tags=["products"])
-app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
-app.include_router(measurements.router, prefix="/api/measurements", tags=["measurements"])
-app.include_router(ar_augmentation.router, prefix="/api/ar", tags=["ar-augmentation"])
+for router, prefix, tag in (
+    (auth.router, "/api/auth", "authentication"),
+    (products.router, "/api/products", "products"),
+    (admin.router, "/api/admin", "admin"),
+    (measurements.router, "/api/measurements", "measurements"),
+    (ar_augmentation.router, "/api/ar", "ar-augmentation"),
+):
+    app.include_router(router, prefix=prefix, tags=[tag])
 
 @app.get("/")
 async def root():
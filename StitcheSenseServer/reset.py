@@ -19,12 +19,21 @@ async def reset_database():
         
         print("🗑️  Dropping existing collections...")
         
-        # Drop all collections
+        # Drop all collections concurrently - each drop is independent
         collections = await db.list_collection_names()
+        await asyncio.gather(*(db.drop_collection(collection_name) for collection_name in collections))
         for collection_name in collections:
-            await db.drop_collection(collection_name)
             print(f"   ✅ Dropped collection: {collection_name}")
         
+        # Dropping a collection drops its indexes too - rebuild them so a running
+        # server keeps working ($text product search, unique user emails)
+        from app.services.product_service import ProductService
+        from app.services.user_service import UserService
+        await asyncio.gather(
+            UserService().ensure_indexes(),
+            ProductService().ensure_indexes()
+        )
+        
         print("✅ Database reset complete!")
         return True
         
@@ -49,40 +58,41 @@ async def create_sample_data():
         admin_data = UserCreate(
             email="admin@stitchesense.com",
             password="admin123",
-            full_name="System Administrator",
+            first_name="System",
+            last_name="Administrator",
             role="admin"
         )
-        admin_user = await user_service.create_user(admin_data)
-        if admin_user:
-            print("   ✅ Created admin user: admin@stitchesense.com")
         
         # Create regular users
         sample_users = [
             {
                 "email": "john.doe@example.com",
                 "password": "password123",
-                "full_name": "John Doe",
+                "first_name": "John",
+                "last_name": "Doe",
                 "role": "user"
             },
             {
                 "email": "jane.smith@example.com",
                 "password": "password123",
-                "full_name": "Jane Smith",
+                "first_name": "Jane",
+                "last_name": "Smith",
                 "role": "user"
             },
             {
                 "email": "emily.johnson@example.com",
                 "password": "password123",
-                "full_name": "Emily Johnson",
+                "first_name": "Emily",
+                "last_name": "Johnson",
                 "role": "user"
             }
         ]
         
-        for user_data in sample_users:
-            user = UserCreate(**user_data)
-            created_user = await user_service.create_user(user)
-            if created_user:
-                print(f"   ✅ Created user: {user_data['email']}")
+        # Insert the admin and all sample users in one batch
+        users = [admin_data] + [UserCreate(**user_data) for user_data in sample_users]
+        created_users = await user_service.bulk_create_users(users)
+        for created_user in created_users:
+            print(f"   ✅ Created {created_user.role}: {created_user.email}")
         
         print("\n👗 Creating sample products...")
         
@@ -181,11 +191,10 @@ async def create_sample_data():
         # Create all sample products
         all_products = wedding_gowns + debut_gowns + modern_gowns
         
-        for product_data in all_products:
-            product = ProductCreate(**product_data)
-            created_product = await product_service.create_product(product)
-            if created_product:
-                print(f"   ✅ Created product: {product_data['name']}")
+        products = [ProductCreate(**product_data) for product_data in all_products]
+        created_products = await product_service.bulk_create_products(products)
+        for created_product in created_products:
+            print(f"   ✅ Created product: {created_product.name}")
         
         print(f"\n✅ Sample data creation complete!")
         print(f"   - Created {len(sample_users) + 1} users (including admin)")
@@ -215,11 +224,10 @@ async def main():
         print("❌ Reset cancelled by user")
         sys.exit(0)
     
-    # Check MongoDB connection
+    # Connect once with the app's motor client (connect_to_mongo pings the server)
+    from app.core.database import connect_to_mongo, close_mongo_connection
     try:
-        import pymongo
-        client = pymongo.MongoClient("mongodb://localhost:27017", serverSelectionTimeoutMS=5000)
-        client.admin.command('ping')
+        await connect_to_mongo()
         print("✅ MongoDB connection verified")
     except Exception as e:
         print(f"❌ MongoDB connection failed: {str(e)}")
@@ -242,6 +250,8 @@ async def main():
     if not await create_sample_data():
         print("⚠️  Sample data creation failed, but database was reset")
     
+    await close_mongo_connection()
+    
     print(f"""
     ╔══════════════════════════════════════════════════════╗
     ║                                                      ║
@@ -4,9 +4,10 @@ StitcheSense Server Start Script
 This script starts the StitcheSense FastAPI server with proper configuration.
 """
 
-import subprocess
+import importlib.util
 import sys
 import os
+import socket
 import time
 from pathlib import Path
 import json
@@ -14,13 +15,12 @@ import json
 def check_dependencies():
     """Check if required dependencies are installed"""
     required_packages = ["fastapi", "uvicorn", "motor", "pymongo"]
-    missing_packages = []
     
-    for package in required_packages:
-        try:
-            __import__(package)
-        except ImportError:
-            missing_packages.append(package)
+    # Only locate the packages - importing them would run their top-level code
+    missing_packages = [
+        package for package in required_packages
+        if importlib.util.find_spec(package) is None
+    ]
     
     if missing_packages:
         print("❌ Missing required packages:")
@@ -34,12 +34,11 @@ def check_dependencies():
 def check_mongodb():
     """Check if MongoDB is running"""
     try:
-        import pymongo
-        client = pymongo.MongoClient("mongodb://localhost:27017", serverSelectionTimeoutMS=5000)
-        client.admin.command('ping')
+        # A TCP connect is enough to tell whether mongod is listening
+        socket.create_connection(("localhost", 27017), timeout=1).close()
         print("✅ MongoDB is running")
         return True
-    except Exception as e:
+    except OSError as e:
         print("❌ MongoDB is not running or not accessible")
         print(f"   Error: {str(e)}")
         print("💡 Please start MongoDB server first")
@@ -49,34 +48,36 @@ def create_admin_user():
     """Create admin user if it doesn't exist"""
     try:
         import asyncio
+        from app.core.database import connect_to_mongo, close_mongo_connection
+        from app.core.security import get_password_hash
         from app.services.user_service import UserService
-        from app.models.user import UserCreate
         
         async def create_admin():
-            user_service = UserService()
-            admin_email = "admin@stitchesense.com"
-            
-            # Check if admin user already exists
-            existing_admin = await user_service.get_user_by_email(admin_email)
-            if existing_admin:
-                print("✅ Admin user already exists")
-                return
-            
-            # Create admin user
-            admin_data = UserCreate(
-                email=admin_email,
-                password="admin123",
-                full_name="System Administrator",
-                role="admin"
-            )
-            
-            admin_user = await user_service.create_user(admin_data)
-            if admin_user:
-                print(f"✅ Created admin user: {admin_email}")
-                print(f"   Password: admin123")
-                print("   ⚠️  Please change the password after first login!")
-            else:
-                print("❌ Failed to create admin user")
+            await connect_to_mongo()
+            try:
+                user_service = UserService()
+                admin_email = "admin@stitchesense.com"
+                
+                # Cheap indexed lookup first so normal starts skip the bcrypt hash
+                # (~250 ms); the upsert below still guards against a concurrent insert
+                if await user_service.get_user_by_email(admin_email):
+                    print("✅ Admin user already exists")
+                    return
+                
+                created = await user_service.upsert_admin(
+                    admin_email,
+                    get_password_hash("admin123"),
+                    first_name="System",
+                    last_name="Administrator"
+                )
+                if created:
+                    print(f"✅ Created admin user: {admin_email}")
+                    print(f"   Password: admin123")
+                    print("   ⚠️  Please change the password after first login!")
+                else:
+                    print("✅ Admin user already exists")
+            finally:
+                await close_mongo_connection()
         
         asyncio.run(create_admin())
         return True
@@ -85,6 +86,14 @@ def create_admin_user():
         print(f"⚠️  Could not create admin user: {str(e)}")
         return False
 
+def gpu_memory_fraction_configured():
+    """Check whether the AR config asks for a fixed TensorFlow GPU pool"""
+    try:
+        with open("app/core/ar_config.json") as f:
+            return bool(json.load(f).get("tensorflow", {}).get("gpu_memory_fraction"))
+    except (OSError, ValueError):
+        return False
+
 def start_server():
     """Start the FastAPI server"""
     print("""
@@ -123,17 +132,15 @@ def start_server():
     print("🏃 Starting server...")
     print(f"{'='*50}")
     
+    # Let TensorFlow grow GPU memory on demand in the server process, unless
+    # install_ar.py configured a fixed pool (gpu_memory_fraction wins)
+    if not gpu_memory_fraction_configured():
+        os.environ["TF_FORCE_GPU_ALLOW_GROWTH"] = "true"
+    
     try:
-        # Start the server
-        cmd = [
-            sys.executable, "-m", "uvicorn", "main:app",
-            "--host", "0.0.0.0",
-            "--port", "8000",
-            "--reload",
-            "--log-level", "info"
-        ]
-        
-        subprocess.run(cmd)
+        # Start the server in this process instead of spawning a new interpreter
+        import uvicorn
+        uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True, log_level="info")
         
     except KeyboardInterrupt:
         print("\n\n🛑 Server stopped by user")